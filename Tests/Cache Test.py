@@ -0,0 +1,241 @@
+####
+#
+# fiction-dl
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Add the fiction_dl package to PATH.
+
+import sys
+
+sys.path.insert(0, "../")
+
+# Application.
+
+from fiction_dl.Core.Cache import Cache
+
+# Standard packages.
+
+from os import urandom
+from pathlib import Path
+import sqlite3
+from tempfile import TemporaryDirectory
+from time import sleep
+
+#
+#
+#
+# Functions.
+#
+#
+#
+
+def CountBlobs(directoryPath: Path) -> int:
+
+    ##
+    #
+    # Counts the blobs stored in a cache.
+    #
+    # @param directoryPath The path of the cache's directory.
+    #
+    # @return The number of blobs.
+    #
+    ##
+
+    connection = sqlite3.connect(directoryPath / "Cache.sqlite")
+
+    try:
+        return connection.execute("SELECT COUNT(*) FROM Blobs").fetchone()[0]
+    finally:
+        connection.close()
+
+def TestDeduplication(directoryPath: Path) -> bool:
+
+    ##
+    #
+    # Checks that identical data is stored once, and removed along with the last item referring to
+    # it.
+    #
+    # @param directoryPath The path of the cache's directory.
+    #
+    # @return **True** if the test has passed, **False** otherwise.
+    #
+    ##
+
+    cache = Cache(directoryPath)
+    data = b"Chapter content. " * 1000
+
+    cache.AddItem("Story 1", "1-Content", data)
+    cache.AddItem("Story 2", "1-Content", data)
+    cache.AddItem("Story 2", "2-Content", data)
+
+    if (1 != CountBlobs(directoryPath)) or (cache.RetrieveItem("Story 2", "2-Content") != data):
+        return False
+
+    cache.RemoveItem("Story 1", "1-Content")
+    cache.RemoveItem("Story 2", "1-Content")
+
+    if (1 != CountBlobs(directoryPath)) or (cache.RetrieveItem("Story 2", "2-Content") != data):
+        return False
+
+    cache.RemoveItem("Story 2", "2-Content")
+
+    return 0 == CountBlobs(directoryPath)
+
+def TestEviction(directoryPath: Path) -> bool:
+
+    ##
+    #
+    # Checks that the least recently used owners are evicted when the size limit is exceeded.
+    #
+    # @param directoryPath The path of the cache's directory.
+    #
+    # @return **True** if the test has passed, **False** otherwise.
+    #
+    ##
+
+    # Random data can't be compressed, so every item takes up (a little more than) its size.
+
+    itemSize = 10000
+    cache = Cache(directoryPath, sizeLimit = int(2.5 * itemSize))
+
+    for owner in ["Story 1", "Story 2", "Story 3"]:
+        cache.AddItem(owner, "Image", urandom(itemSize))
+        sleep(0.01)
+
+    return (
+        (not cache.ContainsItem("Story 1", "Image")) and
+        cache.ContainsItem("Story 2", "Image") and
+        cache.ContainsItem("Story 3", "Image")
+    )
+
+def TestExpiration(directoryPath: Path) -> bool:
+
+    ##
+    #
+    # Checks that items expire after their lifetime (the default one, or their own).
+    #
+    # @param directoryPath The path of the cache's directory.
+    #
+    # @return **True** if the test has passed, **False** otherwise.
+    #
+    ##
+
+    cache = Cache(directoryPath, itemLifetime = 0.5)
+
+    cache.AddItem("Story", "Default Lifetime", b"Data 1")
+    cache.AddItem("Story", "Own Lifetime", b"Data 2", lifetime = 60.0)
+
+    if not (cache.ContainsItem("Story", "Default Lifetime") and cache.ContainsItem("Story", "Own Lifetime")):
+        return False
+
+    sleep(0.6)
+
+    return (
+        (cache.RetrieveItem("Story", "Default Lifetime") is None) and
+        (cache.RetrieveItem("Story", "Own Lifetime") == b"Data 2")
+    )
+
+def TestMigration(directoryPath: Path) -> bool:
+
+    ##
+    #
+    # Checks that items stored by older versions of the application (every item in a separate file,
+    # listed in "Index.xml") are moved to the database.
+    #
+    # @param directoryPath The path of the cache's directory.
+    #
+    # @return **True** if the test has passed, **False** otherwise.
+    #
+    ##
+
+    # Create a cache the way older versions did.
+
+    directoryPath.mkdir(parents = True)
+
+    legacyItems = {
+        ("https://example.com/s/1", "1-Title"): b"Chapter One",
+        ("https://example.com/s/1", "1-Content"): "<p>Zażółć &amp; gęślą</p>".encode(),
+        ("Images", "https://example.com/image.png"): urandom(1000),
+    }
+
+    owners = {}
+
+    for index, ((owner, name), data) in enumerate(legacyItems.items()):
+
+        filePath = directoryPath / f"item{index}"
+        filePath.write_bytes(data)
+
+        owners.setdefault(owner, []).append(
+            f"<Item><Name>{name.replace('&', '&amp;')}</Name><Value>{filePath}</Value></Item>"
+        )
+
+    (directoryPath / "Index.xml").write_text(
+        '<?xml version="1.0" encoding="utf-8"?>\n<Index>' +
+        "".join(f"<Owner><Name>{owner}</Name><Items>{''.join(items)}</Items></Owner>" for owner, items in owners.items()) +
+        "</Index>",
+        encoding = "utf-8"
+    )
+
+    # Migrate it.
+
+    cache = Cache(directoryPath)
+
+    if not all(cache.RetrieveItem(owner, name) == data for (owner, name), data in legacyItems.items()):
+        return False
+
+    # Check that the old files have been removed.
+
+    return not any(x for x in directoryPath.iterdir() if not x.name.startswith("Cache.sqlite"))
+
+#
+#
+#
+# The start-up routine.
+#
+#
+#
+
+#
+# Run the cache test: check deduplication, eviction (to the size limit), expiration and migration of
+# caches created by older versions of the application.
+#
+
+tests = [TestDeduplication, TestEviction, TestExpiration, TestMigration]
+failedTests = []
+
+with TemporaryDirectory() as workingDirectory:
+
+    for test in tests:
+
+        if not test(Path(workingDirectory) / test.__name__):
+            failedTests.append(test.__name__)
+
+for name in failedTests:
+    print(f"! {name} has failed.")
+
+print(f"# Passed {len(tests) - len(failedTests)}/{len(tests)} case(s).")
+
+sys.exit(1 if failedTests else 0)
\ No newline at end of file
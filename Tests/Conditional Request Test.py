@@ -0,0 +1,215 @@
+####
+#
+# fiction-dl
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Add the fiction_dl package to PATH.
+
+import sys
+
+sys.path.insert(0, "../")
+
+# Application.
+
+from fiction_dl.Core.Cache import Cache
+from fiction_dl.Core.SessionPool import SharedSessionPool
+from fiction_dl.Extractors.ExtractorXenForo import ExtractorXenForo
+
+# Standard packages.
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from threading import Thread
+from typing import List
+
+# Non-standard packages.
+
+from dreamy_utilities.Web import GetHostname
+
+#
+#
+#
+# Classes.
+#
+#
+#
+
+##
+#
+# A XenForo forum serving a single story. Pages are sent with validators, and requests carrying
+# matching ones are answered with "304 Not Modified".
+#
+##
+
+class ForumRequestHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self) -> None:
+
+        ##
+        #
+        # Handles a GET request.
+        #
+        ##
+
+        path = self.path.split("?")[0]
+
+        if path not in self.Pages:
+
+            self.send_response(404)
+            self.end_headers()
+
+            return
+
+        conditional = ("If-None-Match" in self.headers) or ("If-Modified-Since" in self.headers)
+        self.Requests.append((path, conditional))
+
+        if self.headers.get("If-None-Match") == self._EntityTag:
+
+            self.send_response(304)
+            self.end_headers()
+
+            return
+
+        content = self.Pages[path].encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        self.send_header("ETag", self._EntityTag)
+        self.send_header("Last-Modified", "Mon, 01 Mar 2021 12:00:00 GMT")
+        self.end_headers()
+
+        self.wfile.write(content)
+
+    def log_message(self, *arguments) -> None:
+
+        ##
+        #
+        # Silences the server.
+        #
+        ##
+
+        pass
+
+    # The pages of the forum.
+    Pages = {
+        "/threads/test-story.1/":
+            '<html><body><h1 class="p-title-value">Test Story</h1></body></html>',
+        "/threads/test-story.1/threadmarks-load-range":
+            "<html><body>"
+            '<div data-content-author="Tester" data-content-date="1600000000"></div>'
+            '<div data-content-author="Tester" data-content-date="1610000000"></div>'
+            '<div class="structItem-title"><a href="/threads/test-story.1/post-1">One</a></div>'
+            '<div class="structItem-title"><a href="/threads/test-story.1/post-2">Two</a></div>'
+            "</body></html>",
+    }
+
+    # The requests received: (path, was the request conditional?) tuples.
+    Requests: List = []
+
+    # The entity tag of every page.
+    _EntityTag = '"test-story"'
+
+##
+#
+# The XenForo extractor, pointed at the local forum.
+#
+##
+
+class ExtractorLocalForum(ExtractorXenForo):
+
+    def GetSupportedHostnames(self) -> List[str]:
+
+        ##
+        #
+        # Returns a list of hostnames supposed to be supported by the extractor.
+        #
+        # @return A list of supported hostnames.
+        #
+        ##
+
+        return [GetHostname(self._forumURL)]
+
+#
+#
+#
+# The start-up routine.
+#
+#
+#
+
+#
+# Run the conditional request test: scan a XenForo story twice. The second scan should request the
+# index pages conditionally, and parse the cached copies.
+#
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), ForumRequestHandler)
+Thread(target = server.serve_forever, daemon = True).start()
+
+forumURL = f"http://127.0.0.1:{server.server_port}/"
+storyURL = f"{forumURL}threads/test-story.1/"
+
+failedCases = []
+
+with TemporaryDirectory() as cacheDirectory:
+
+    cache = Cache(Path(cacheDirectory))
+    stories = []
+
+    for _ in range(2):
+
+        ForumRequestHandler.Requests = []
+
+        extractor = ExtractorLocalForum(forumURL)
+        extractor.SetCache(cache)
+
+        if not (extractor.Initialize(storyURL) and extractor.ScanStory()):
+            failedCases.append("Failed to scan the story.")
+            break
+
+        stories.append((extractor.Story.Metadata.Title, extractor.Story.Metadata.ChapterCount))
+
+    else:
+
+        if not ForumRequestHandler.Requests:
+            failedCases.append("The second scan hasn't requested any page.")
+
+        elif not all(conditional for path, conditional in ForumRequestHandler.Requests):
+            failedCases.append("The second scan has requested some pages unconditionally.")
+
+        if stories[0] != stories[1] or stories[0] != ("Test Story", 2):
+            failedCases.append(f"The cached pages have been parsed incorrectly: {stories}.")
+
+server.shutdown()
+SharedSessionPool.Close()
+
+for case in failedCases:
+    print(f"! {case}")
+
+print(f"# Passed {3 - len(failedCases)}/3 case(s).")
+
+sys.exit(1 if failedCases else 0)
\ No newline at end of file
@@ -0,0 +1,97 @@
+####
+#
+# fiction-dl
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Add the fiction_dl package to PATH.
+
+import sys
+
+sys.path.insert(0, "../")
+
+# Application.
+
+import fiction_dl.Configuration as Configuration
+from fiction_dl.Processors.ContentProcessor import ContentProcessor
+from fiction_dl.Utilities.HTML import IsMarkupSimple, ReformatHTMLToXHTML, StripEmptyTags, StripHTML, StripTags
+
+#
+#
+#
+# The start-up routine.
+#
+#
+#
+
+#
+# Run the HTML compatibility test: process every case (line) of the datasets using both HTML parsers and
+# compare the results. The lxml fast path has to produce exactly the same output as html.parser does.
+#
+
+DatasetFilePaths = [
+    "HTML Compatibility Test Dataset.txt",
+    "Typography Test Dataset.txt",
+]
+
+Functions = {
+    "ContentProcessor": lambda code: ContentProcessor().Process(code),
+    "ReformatHTMLToXHTML": lambda code: ReformatHTMLToXHTML(code),
+    "StripEmptyTags": lambda code: StripEmptyTags(code, ["hr", "img"]),
+    "StripHTML": lambda code: StripHTML(code),
+    "StripTags": lambda code: StripTags(code, ["p", "img", "hr", "b", "strong", "i", "em", "u", "a"]),
+}
+
+cases = []
+
+for filePath in DatasetFilePaths:
+    with open(filePath, encoding = "utf-8") as file:
+        cases += file.read().split("\n")
+
+failedCaseCount = 0
+
+for index, case in enumerate(cases, start = 1):
+
+    caseFailed = False
+
+    for name, function in Functions.items():
+
+        Configuration.HTMLParserName = "html.parser"
+        expectedOutput = function(case)
+
+        Configuration.HTMLParserName = "lxml"
+        output = function(case)
+
+        if output != expectedOutput:
+            print(f"! Case {index} ({name}) has failed.")
+            caseFailed = True
+
+    failedCaseCount += caseFailed
+
+simpleCaseCount = sum(IsMarkupSimple(case) for case in cases)
+
+print(f"# Passed {len(cases) - failedCaseCount}/{len(cases)} case(s) ({simpleCaseCount} simple).")
+
+sys.exit(1 if failedCaseCount else 0)
\ No newline at end of file
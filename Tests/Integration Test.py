@@ -63,9 +63,14 @@ arguments = Namespace(
     Pack = False,
     Verbose = True,
     Force = True,
+    Update = False,
     Debug = True,
     Images = True,
     PersistentCache = True,
+    CacheSizeLimit = CacheSizeLimit,
+    CacheItemLifetime = CacheItemLifetime,
+    JobCount = MaximumConcurrentStoryDownloads,
+    Formats = OutputFormats,
     LibreOffice = GetLibreOfficeExecutablePath() or Path(),
     Output = OutputDirectoryPath,
     Input = "Integration Test Dataset 1.txt"
@@ -82,9 +87,14 @@ arguments = Namespace(
     Pack = True,
     Verbose = True,
     Force = True,
+    Update = False,
     Debug = True,
     Images = True,
     PersistentCache = True,
+    CacheSizeLimit = CacheSizeLimit,
+    CacheItemLifetime = CacheItemLifetime,
+    JobCount = MaximumConcurrentStoryDownloads,
+    Formats = OutputFormats,
     LibreOffice = GetLibreOfficeExecutablePath() or Path(),
     Output = OutputDirectoryPath,
     Input = "Integration Test Dataset 3.txt"
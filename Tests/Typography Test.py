@@ -0,0 +1,86 @@
+####
+#
+# fiction-dl
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Add the fiction_dl package to PATH.
+
+import sys
+
+sys.path.insert(0, "../")
+
+# Application.
+
+from fiction_dl.Processors.TypographyProcessor import TypographyProcessor
+
+#
+#
+#
+# The start-up routine.
+#
+#
+#
+
+#
+# Run the typography test: process every case (line) of the dataset and compare the results with the
+# expected output. Run with "-update" to regenerate the expected output after an intentional change
+# of the rules.
+#
+
+DatasetFilePath = "Typography Test Dataset.txt"
+ExpectedOutputFilePath = "Typography Test Expected Output.txt"
+
+with open(DatasetFilePath, encoding = "utf-8") as file:
+    cases = file.read().split("\n")
+
+outputs = [TypographyProcessor().Process(case) or "" for case in cases]
+
+if "-update" in sys.argv:
+
+    with open(ExpectedOutputFilePath, "w", encoding = "utf-8", newline = "\r\n") as file:
+        file.write("\n".join(outputs))
+
+    print(f"# Updated the expected output ({len(outputs)} case(s)).")
+    sys.exit()
+
+with open(ExpectedOutputFilePath, encoding = "utf-8") as file:
+    expectedOutputs = file.read().split("\n")
+
+failedCases = [
+    index
+    for index, (output, expectedOutput) in enumerate(zip(outputs, expectedOutputs), start = 1)
+    if output != expectedOutput
+]
+
+if len(outputs) != len(expectedOutputs):
+    print(f"! The dataset has {len(outputs)} case(s), the expected output {len(expectedOutputs)}.")
+
+for index in failedCases:
+    print(f"! Case {index} has failed.")
+
+print(f"# Passed {len(outputs) - len(failedCases)}/{len(outputs)} case(s).")
+
+sys.exit(1 if (failedCases or (len(outputs) != len(expectedOutputs))) else 0)
\ No newline at end of file
@@ -0,0 +1,218 @@
+####
+#
+# fiction-dl
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Add the fiction_dl package to PATH.
+
+import sys
+
+sys.path.insert(0, "../")
+
+# Application.
+
+from fiction_dl.Core.Application import Application
+from fiction_dl.Extractors.ExtractorTextFile import ExtractorTextFile
+from fiction_dl.Formatters.FormatterHTML import FormatterHTML
+import fiction_dl.Configuration as Configuration
+
+# Standard packages.
+
+from argparse import Namespace
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+#
+#
+#
+# Functions.
+#
+#
+#
+
+def WriteStory(filePath: Path, chapterCount: int) -> None:
+
+    ##
+    #
+    # Writes a local text story.
+    #
+    # @param filePath     The path of the story file.
+    # @param chapterCount The number of chapters.
+    #
+    ##
+
+    lines = [
+        Configuration.TextSourceFileMagicText,
+        "https://example.com/update-test",
+        "Update Test",
+        "Tester",
+        "A story used to test the update mode.",
+    ]
+
+    for index in range(1, chapterCount + 1):
+
+        if 1 != index:
+            lines.append(Configuration.TextSourceFileChapterBreak)
+
+        lines.append(f"<p>The content of chapter {index}.</p>")
+
+    filePath.write_text("\n".join(lines), encoding = "utf-8")
+
+def Download(workingDirectoryPath: Path) -> None:
+
+    ##
+    #
+    # Downloads (or updates) the story.
+    #
+    # @param workingDirectoryPath The directory containing the story file and the output.
+    #
+    ##
+
+    arguments = Namespace(
+        Authenticate = False,
+        ClearCache = False,
+        Pack = False,
+        Verbose = False,
+        Force = False,
+        Update = True,
+        Debug = False,
+        Images = False,
+        PersistentCache = False,
+        CacheSizeLimit = Configuration.CacheSizeLimit,
+        CacheItemLifetime = Configuration.CacheItemLifetime,
+        JobCount = 1,
+        Formats = ["HTML", "EPUB"],
+        LibreOffice = Path(),
+        Output = str(workingDirectoryPath / "Output"),
+        Input = str(workingDirectoryPath / "Story.txt")
+    )
+
+    Application(
+        arguments = arguments,
+        cacheDirectoryPath = workingDirectoryPath / "Cache"
+    ).Launch()
+
+def ReadOutputFiles(workingDirectoryPath: Path) -> dict:
+
+    ##
+    #
+    # Reads the output files.
+    #
+    # @param workingDirectoryPath The directory containing the output.
+    #
+    # @return A dictionary: keys are file names, values are the contents of the files.
+    #
+    ##
+
+    return {
+        filePath.name: filePath.read_bytes()
+        for filePath in (workingDirectoryPath / "Output").rglob("*")
+        if filePath.is_file()
+    }
+
+#
+#
+#
+# The start-up routine.
+#
+#
+#
+
+#
+# Run the update test: download a story, then update it with failing chapter extraction and failing
+# formatting (which should both leave the existing output files and the manifest untouched), then
+# update it successfully.
+#
+
+failedCases = []
+
+with TemporaryDirectory() as workingDirectory:
+
+    workingDirectoryPath = Path(workingDirectory)
+
+    Configuration.SkippedURLsFilePath = workingDirectoryPath / "Skipped URLs.txt"
+
+    # Download the story.
+
+    WriteStory(workingDirectoryPath / "Story.txt", 3)
+    Download(workingDirectoryPath)
+
+    originalFiles = ReadOutputFiles(workingDirectoryPath)
+
+    if sorted(originalFiles) != ["Update Test.epub", "Update Test.html", "Update Test.json"]:
+        failedCases.append(f"The initial download has produced unexpected files: {sorted(originalFiles)}.")
+
+    # Fail to extract a new chapter.
+
+    WriteStory(workingDirectoryPath / "Story.txt", 5)
+
+    OriginalExtractChapter = ExtractorTextFile.ExtractChapter
+    ExtractorTextFile.ExtractChapter = lambda self, index: \
+        None if (4 == index) else OriginalExtractChapter(self, index)
+
+    Download(workingDirectoryPath)
+
+    ExtractorTextFile.ExtractChapter = OriginalExtractChapter
+
+    if ReadOutputFiles(workingDirectoryPath) != originalFiles:
+        failedCases.append("A failed chapter extraction has modified the existing output files.")
+
+    # Fail to format the story.
+
+    OriginalFormatAndSave = FormatterHTML.FormatAndSave
+    FormatterHTML.FormatAndSave = lambda self, story, filePath: False
+
+    Download(workingDirectoryPath)
+
+    FormatterHTML.FormatAndSave = OriginalFormatAndSave
+
+    if ReadOutputFiles(workingDirectoryPath) != originalFiles:
+        failedCases.append("A failed formatting has modified the existing output files.")
+
+    # Update the story.
+
+    Download(workingDirectoryPath)
+
+    updatedFiles = ReadOutputFiles(workingDirectoryPath)
+
+    if sorted(updatedFiles) != sorted(originalFiles):
+        failedCases.append(f"The update has produced unexpected files: {sorted(updatedFiles)}.")
+
+    elif len(json.loads(updatedFiles["Update Test.json"])["Chapters"]) != 5:
+        failedCases.append("The updated manifest doesn't list all the chapters.")
+
+    elif b"The content of chapter 5." not in updatedFiles["Update Test.html"]:
+        failedCases.append("The updated HTML file doesn't contain the new chapters.")
+
+print()
+
+for case in failedCases:
+    print(f"! {case}")
+
+print(f"# Passed {4 - len(failedCases)}/4 case(s).")
+
+sys.exit(1 if failedCases else 0)
\ No newline at end of file
@@ -31,6 +31,8 @@
 from fiction_dl.Concepts.Chapter import Chapter
 from fiction_dl.Concepts.Story import Story
 import fiction_dl.Configuration as Configuration
+from fiction_dl.Core.Cache import Cache
+from fiction_dl.Core.ConditionalWebSession import ConditionalWebSession
 
 # Standard packages.
 
@@ -41,10 +43,9 @@ from typing import List, Optional
 
 # Non-standard packages.
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from dreamy_utilities.Interface import Interface
 from dreamy_utilities.Web import GetHostname
-from dreamy_utilities.WebSession import WebSession
 from fake_useragent import UserAgent
 
 #
@@ -85,7 +86,7 @@ class Extractor:
 
         self.Story = None
 
-        self._webSession = WebSession(UserAgent().random)
+        self._webSession = ConditionalWebSession(self._UserAgents.random)
         self._chapterURLs = []
 
         self._downloadStorySoupWhenScanning = True
@@ -117,6 +118,32 @@ class Extractor:
 
         return True
 
+    def SupportsConcurrentExtraction(self) -> bool:
+
+        ##
+        #
+        # Checks whether chapters can be extracted concurrently, i.e. whether ExtractChapter() can be
+        # called from multiple threads at once.
+        #
+        # @return **True** if they can, **False** otherwise.
+        #
+        ##
+
+        return True
+
+    def SetCache(self, cache: Optional[Cache]) -> None:
+
+        ##
+        #
+        # Sets the cache used to store the story's index page, so that it can be requested
+        # conditionally (and retrieved from the cache if it hasn't changed) next time.
+        #
+        # @param cache The cache. If **None**, pages are always downloaded in full.
+        #
+        ##
+
+        self._webSession.Cache = cache
+
     def SupportsAuthentication(self) -> bool:
 
         ##
@@ -195,7 +222,7 @@ class Extractor:
 
         if self._downloadStorySoupWhenScanning:
 
-            soup = self._webSession.GetSoup(normalizedURL)
+            soup = self._webSession.GetSoup(normalizedURL, conditional = True)
 
             if not soup:
                 logging.error(f'Failed to download tag soup: "{normalizedURL}".')
@@ -229,13 +256,35 @@ class Extractor:
 
         if self._downloadChapterSoupWhenExtracting:
 
-            soup = self._webSession.GetSoup(chapterURL, self._chapterParserName)
+            soup = self._DownloadSoup(
+                chapterURL,
+                self._chapterParserName,
+                self._GetChapterSoupStrainer(chapterURL)
+            )
+
             if not soup:
                 logging.error(f'Failed to download tag soup: "{chapterURL}".')
                 return None
 
         return self._InternallyExtractChapter(chapterURL, soup)
 
+    def GetChapterPageURL(self, index: int) -> Optional[str]:
+
+        ##
+        #
+        # Returns the URL of the page specific chapter is extracted from. Chapters located on the same
+        # page are extracted one after another, and the page is downloaded only once (if the extractor
+        # supports it).
+        #
+        # @param index The index of the chapter.
+        #
+        # @return The URL of the page, or **None** if the chapter doesn't share its page with other
+        #         chapters.
+        #
+        ##
+
+        return None
+
     def ExtractMedia(self, URL: str) -> Optional[bytes]:
 
         ##
@@ -253,6 +302,51 @@ class Extractor:
 
         return self._webSession.Get(URL, text = False, stream = True)
 
+    def _DownloadSoup(
+        self,
+        URL: str,
+        parserName: str = "html.parser",
+        parseOnly: Optional[SoupStrainer] = None
+    ) -> Optional[BeautifulSoup]:
+
+        ##
+        #
+        # Downloads a page and creates its tag soup.
+        #
+        # @param URL        The URL of the page.
+        # @param parserName The parser to be used.
+        # @param parseOnly  The strainer restricting parsing to the elements matching it (and their
+        #                   contents). If **None**, the whole page is parsed.
+        #
+        # @return The tag soup, or **None** if the page couldn't be downloaded.
+        #
+        ##
+
+        if parseOnly is None:
+            return self._webSession.GetSoup(URL, parserName)
+
+        data = self._webSession.Get(URL)
+        if not data:
+            return None
+
+        return BeautifulSoup(data, features = parserName, parse_only = parseOnly)
+
+    def _GetChapterSoupStrainer(self, URL: str) -> Optional[SoupStrainer]:
+
+        ##
+        #
+        # Returns the strainer restricting parsing of a chapter page to the elements the extractor needs
+        # to extract the chapter. Pages on some sites weigh hundreds of kilobytes, while the chapter is
+        # only a small part of them. Note that the strainer is ignored by the "html5lib" parser.
+        #
+        # @param URL The URL of the chapter.
+        #
+        # @return The strainer, or **None** if the whole page is to be parsed.
+        #
+        ##
+
+        return None
+
     def _InternallyScanStory(
         self,
         URL: str,
@@ -318,4 +412,8 @@ class Extractor:
         #
         ##
 
-        return URL
\ No newline at end of file
+        return URL
+
+    # The source of random user agents, shared by all extractors (loading it takes a while).
+
+    _UserAgents = UserAgent()
\ No newline at end of file
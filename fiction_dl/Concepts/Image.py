@@ -28,9 +28,10 @@
 
 # Standard packages.
 
+from concurrent.futures import Executor
 from io import BytesIO
 import logging
-from typing import Optional
+from typing import Optional, Tuple
 
 # Non-standard packages.
 
@@ -70,17 +71,25 @@ class Image:
         self.W = None
         self.H = None
 
-    def CreateFromData(self, data: bytes, side: Optional[int] = None, quality: int = 75) -> bool:
+    def CreateFromData(
+        self,
+        data: bytes,
+        side: Optional[int] = None,
+        quality: int = 75,
+        executor: Optional[Executor] = None
+    ) -> bool:
 
         ##
         #
         # Creates an image from binary data. The image is then optionally scaled down to fit the maximum side length
         # provided as an argument.
         #
-        # @param data    Encoded image data.
-        # @param side    The maximum length of the longer side of the image. The image
-        #                will be scaled down proportionally to fit.
-        # @param quality The quality of the output image (1 - 100).
+        # @param data     Encoded image data.
+        # @param side     The maximum length of the longer side of the image. The image
+        #                 will be scaled down proportionally to fit.
+        # @param quality  The quality of the output image (1 - 100).
+        # @param executor The executor (a process pool, for example) used to process the image. If
+        #                 **None**, the image is processed in the calling thread.
         #
         # @return **True** if the image has been created correctly, **False** otherwise.
         #
@@ -91,10 +100,10 @@ class Image:
 
         try:
 
-            processedImage =                                        \
-                CreateImageFromDataUsingOpenCV(data, side, quality) \
-                or                                                  \
-                CreateImageFromDataUsingPIL(data, side, quality)
+            processedImage =                                                       \
+                executor.submit(CreateImageFromData, data, side, quality).result() \
+                if executor else                                                   \
+                CreateImageFromData(data, side, quality)
 
             if processedImage is None:
                 logging.info(f"Failed to create image from data: \"{self.URL}\".")
@@ -111,6 +120,38 @@ class Image:
 
         return True
 
+    def CreateFromProcessedData(self, data: bytes) -> bool:
+
+        ##
+        #
+        # Creates an image from data that has already been processed by CreateFromData() (retrieved
+        # from the cache, for example). The data is not re-encoded: only the header is read, to
+        # determine the dimensions of the image.
+        #
+        # @param data Encoded image data.
+        #
+        # @return **True** if the image has been created correctly, **False** otherwise.
+        #
+        ##
+
+        if not data:
+            return False
+
+        try:
+
+            width, height = PIL.Image.open(BytesIO(data)).size
+
+        except:
+
+            logging.info(f"An exception has occurred while reading processed image data: \"{self.URL}\".")
+            return False
+
+        self.Data = data
+        self.W = width
+        self.H = height
+
+        return True
+
     def __bool__(self) -> bool:
 
         ##
@@ -132,6 +173,27 @@ class Image:
 #
 #
 
+def CreateImageFromData(data: bytes, side: Optional[int] = None, quality: int = 75) -> Optional[Tuple[bytes, int, int]]:
+
+    ##
+    #
+    # Creates an image from binary data, using OpenCV or - if OpenCV fails - PIL. The image is then optionally scaled
+    # down to fit the maximum side length provided as an argument.
+    #
+    # @param data    Encoded image data.
+    # @param side    The maximum length of the longer side of the image. The image will be scaled down proportionally
+    #                to fit.
+    # @param quality The quality of the output image (1 - 100).
+    #
+    # @return A tuple consisting of encoded image data, image width and image height; **None** if something fails.
+    #
+    ##
+
+    return                                                  \
+        CreateImageFromDataUsingOpenCV(data, side, quality) \
+        or                                                  \
+        CreateImageFromDataUsingPIL(data, side, quality)
+
 def CreateImageFromDataUsingOpenCV(data: bytes, side: Optional[int] = None, quality: int = 75) -> bool:
 
     ##
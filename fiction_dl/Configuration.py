@@ -70,8 +70,57 @@ WelcomingMessage = f"{ApplicationName} {ApplicationVersion}, by {CreatorName} ({
 # Maximum length of the longer side of an embedded image.
 MaximumImageSideLength = 800
 
-# The time application waits after downloading a chapter, in seconds.
-PostChapterSleepTime = 1.0
+# The size of the cover image (of EPUB files), in pixels.
+CoverImageWidth = 1200
+CoverImageHeight = 1600
+
+# The maximum number of stories downloaded at once, and the maximum number of stories downloaded at once from a
+# single site.
+MaximumConcurrentStoryDownloads = 4
+MaximumConcurrentStoryDownloadsPerHost = 1
+
+# The maximum number of chapters downloaded at once (per story).
+MaximumConcurrentChapterDownloads = 4
+
+# The maximum number of images downloaded at once (per story), and the number of processes used to process (scale
+# down and re-encode) images. The number of processors is used if the latter is None.
+MaximumConcurrentImageDownloads = 8
+ImageProcessingProcessCount = None
+
+# The maximum number of conversions to MOBI (performed by Calibre, in the background) running at once.
+MaximumConcurrentMOBIConversions = 2
+
+# The maximum number of requests sent to a single host per second, and the number of requests that can be
+# sent to it at once after a period of inactivity. Applies only to sites requiring breaks between requests.
+MaximumRequestRate = 1.0
+MaximumRequestBurst = 1
+
+# The maximum number of connections kept open to a single host. Connections (and cookies) are shared by all the
+# extractors; requests wait for a free connection when all of them are in use.
+MaximumConnectionsPerHost = 8
+
+# The output formats the application can generate (this list isn't meant to be modified), and the ones generated by
+# default. The formats others are converted from (ODT for PDF, EPUB for MOBI) are generated whenever they're needed.
+SupportedOutputFormats = ("HTML", "ODT", "PDF", "EPUB", "MOBI")
+OutputFormats = list(SupportedOutputFormats)
+
+# Keep a LibreOffice instance running in the background and convert documents (to PDF) using it, instead of starting
+# LibreOffice for every story. Requires LibreOffice's Python bindings ("uno"), importable by the interpreter running the
+# application: they come with LibreOffice's own Python, or with the "python3-uno" package on Debian-derived Linux
+# distributions, but aren't installed by pip. LibreOffice is started for every story if they aren't available. The
+# time to wait for the instance to start, in seconds.
+UseLibreOfficeServer = True
+LibreOfficeServerStartupTimeout = 30.0
+
+# The parser used to process HTML code: "lxml" (fast) or "html.parser" (slow). lxml is used only for simple markup,
+# i.e. markup it's known to parse exactly the way html.parser does - everything else is processed by the latter.
+HTMLParserName = "lxml"
+
+# The maximum total size of the cache, in megabytes. Unlimited if None.
+CacheSizeLimit = None
+
+# The lifetime of cached items, in days. Unlimited if None.
+CacheItemLifetime = None
 
 # About repeated connection attempts.
 MaximumConnectionAttemptCount = 10
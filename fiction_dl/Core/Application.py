@@ -30,20 +30,26 @@
 
 from fiction_dl.Concepts.Chapter import Chapter
 from fiction_dl.Concepts.Extractor import Extractor
+from fiction_dl.Concepts.Image import Image
 from fiction_dl.Concepts.Story import Story
 from fiction_dl.Concepts.StoryPackage import StoryPackage
 from fiction_dl.Core.Cache import Cache
 from fiction_dl.Core.InputData import InputData
+from fiction_dl.Core.LibreOfficeServer import LibreOfficeServer
+from fiction_dl.Core.OutputBuffer import OutputBuffer
+from fiction_dl.Core.OutputBufferLoggingHandler import OutputBufferLoggingHandler
+from fiction_dl.Core.RateLimiter import RateLimiter
+from fiction_dl.Core.SessionPool import SharedSessionPool
+from fiction_dl.Core.TaskGraph import TaskGraph
 from fiction_dl.Extractors.ExtractorTextFile import ExtractorTextFile
 from fiction_dl.Formatters.FormatterEPUB import FormatterEPUB
 from fiction_dl.Formatters.FormatterHTML import FormatterHTML
 from fiction_dl.Formatters.FormatterMOBI import FormatterMOBI
 from fiction_dl.Formatters.FormatterODT import FormatterODT
 from fiction_dl.Formatters.FormatterPDF import FormatterPDF
-from fiction_dl.Processors.SanitizerProcessor import SanitizerProcessor
-from fiction_dl.Processors.TypographyProcessor import TypographyProcessor
+from fiction_dl.Processors.ContentProcessor import ContentProcessor
 from fiction_dl.Utilities.Extractors import CreateExtractor
-from fiction_dl.Utilities.General import RenderPDFPageToBytes
+from fiction_dl.Utilities.Cover import GetCoverText, RenderCoverToBytes
 from fiction_dl.Utilities.HTML import FindImagesInCode, MakeURLAbsolute
 from fiction_dl.Utilities.Text import GetPrintableStoryTitle, Transliterate
 import fiction_dl. Configuration as Configuration
@@ -51,24 +57,30 @@ import fiction_dl. Configuration as Configuration
 # Standard packages.
 
 from argparse import Namespace
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+import json
 import logging
+from os import replace
 from os.path import expandvars, isfile
 from pathlib import Path
 import re
 from requests.exceptions import ConnectionError
 from ssl import SSLError
-from time import sleep
-from typing import Dict, List, Optional, Union
+import sys
+from tempfile import TemporaryDirectory
+from threading import Lock
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 from urllib3.exceptions import ProtocolError
 
 # Non-standard packages.
 
 from cloudscraper.exceptions import CloudflareChallengeError
 from dreamy_utilities.Containers import RemoveDuplicates
-from dreamy_utilities.Filesystem import FindExecutable, GetSanitizedFileName, WriteTextFile
+from dreamy_utilities.Filesystem import FindExecutable, GetSanitizedFileName, ReadTextFile, WriteTextFile
 from dreamy_utilities.Interface import Interface
 from dreamy_utilities.Text import GetCurrentDate, Stringify, Truncate
-from dreamy_utilities.Web import GetSiteURL
+from dreamy_utilities.Web import GetHostname, GetSiteURL
 
 #
 #
@@ -98,9 +110,46 @@ class Application:
 
         self._arguments = arguments
 
-        self._cache = Cache(cacheDirectoryPath)
+        self._outputFormats = set(arguments.Formats)
+        self._outputFormats.update(self._SourceFormats[x] for x in arguments.Formats if x in self._SourceFormats)
+
+        cacheSizeLimit = arguments.CacheSizeLimit
+        cacheItemLifetime = arguments.CacheItemLifetime
+
+        self._cache = Cache(
+            cacheDirectoryPath,
+            sizeLimit = int(cacheSizeLimit * 1024 * 1024) if cacheSizeLimit else None,
+            itemLifetime = (cacheItemLifetime * 24 * 60 * 60) if cacheItemLifetime else None
+        )
+
         self._interface = Interface()
 
+        self._rateLimiter = RateLimiter(Configuration.MaximumRequestRate, Configuration.MaximumRequestBurst)
+
+        self._imageProcessingPool = None
+        self._imageProcessingPoolLock = Lock()
+
+        self._outputBuffer: Optional[OutputBuffer] = None
+
+        self._pendingUpdates: Dict[str, Optional[Dict]] = {}
+        self._pendingUpdatesLock = Lock()
+
+        self._mobiConversionPool = ThreadPoolExecutor(max(1, Configuration.MaximumConcurrentMOBIConversions))
+        self._mobiConversions: List[Tuple[Path, Future]] = []
+        self._mobiConversionsLock = Lock()
+
+        self._libreOfficeServer = None
+
+        if Configuration.UseLibreOfficeServer and ("PDF" in self._outputFormats):
+
+            if LibreOfficeServer.IsAvailable():
+                self._libreOfficeServer = LibreOfficeServer(arguments.LibreOffice)
+            else:
+                logging.info(
+                    "LibreOffice's Python bindings (\"uno\") aren't available to this interpreter: LibreOffice "
+                    "will be started separately for every document converted to PDF."
+                )
+
     def Launch(self) -> None:
 
         ##
@@ -109,157 +158,359 @@ class Application:
         #
         ##
 
-        # Welcome the user and clear the cache.
+        try:
 
-        self._interface.Text(Configuration.WelcomingMessage, bold = True)
+            # Welcome the user and clear the cache.
 
-        if self._arguments.ClearCache:
-            logging.info("Deleting the cache...")
-            self._cache.Clear()
+            self._interface.Text(Configuration.WelcomingMessage, bold = True)
 
-        # Print notices.
+            if self._arguments.ClearCache:
+                logging.info("Deleting the cache...")
+                self._cache.Clear()
 
-        if (notices := self._GenerateNotices()):
+            # Print notices.
 
-            self._interface.EmptyLine()
+            if (notices := self._GenerateNotices()):
 
-            for notice in notices:
-                self._interface.Notice(notice)
+                self._interface.EmptyLine()
 
-        # Process the input arguments.
+                for notice in notices:
+                    self._interface.Notice(notice)
 
-        self._interface.Process("Processing input arguments...", section = True)
+            # Process the input arguments.
 
-        inputData = InputData(self._arguments.Input)
-        if not self._arguments.Pack:
-            inputData.ExpandAndShuffle()
-        else:
-            inputData.Expand()
+            self._interface.Process("Processing input arguments...", section = True)
+
+            inputData = InputData(self._arguments.Input)
+            if not self._arguments.Pack:
+                inputData.ExpandAndShuffle()
+            else:
+                inputData.Expand()
 
-        URLs = inputData.Access()
+            URLs = inputData.Access()
 
-        self._interface.Comment(f"The list contains {len(URLs)} item(s).")
+            self._interface.Comment(f"The list contains {len(URLs)} item(s).")
 
-        # Process the stories.
+            # Process the stories.
 
-        downloadedStories = []
-        skippedURLs = []
+            downloadedStories = {}
+            skippedURLs = []
 
-        for index, URL in enumerate(URLs, start = 1):
+            for index, URL, newlyDownloadedStory in self._DownloadStories(URLs):
+
+                if not newlyDownloadedStory:
+                    skippedURLs.append(URL)
+
+                # Stories that are up to date (in update mode) don't need to be saved again.
+
+                if isinstance(newlyDownloadedStory, Story):
+
+                    if not self._arguments.Pack:
+
+                        if not self._arguments.Debug:
+
+                            try:
+
+                                if not self._FormatAndSaveStoryOrPackage(newlyDownloadedStory):
+                                    skippedURLs.append(URL)
+
+                            except FileNotFoundError as caughtException:
+
+                                self._interface.Error(f"A filesystem exception has occurred: {caughtException}")
+                                self._interface.GrabUserAttention()
+                                skippedURLs.append(URL)
+
+                            except:
+
+                                self._interface.Error("An exception has been thrown.")
+                                self._interface.GrabUserAttention()
+                                skippedURLs.append(URL)
+
+                        elif not self._FormatAndSaveStoryOrPackage(newlyDownloadedStory):
+
+                            skippedURLs.append(URL)
+
+                    else:
+
+                        downloadedStories[index] = newlyDownloadedStory
 
             self._interface.LineBreak()
-            self._interface.Text(f'{index}/{len(URLs)}: "{URL}".', section = True, bold = True)
 
-            newlyDownloadedStory = None
+            # Print information about skipped stories.
 
-            if not self._arguments.Debug:
+            if skippedURLs:
 
-                try:
+                print()
 
-                    sleep(Configuration.PostChapterSleepTime)
+                for URL in skippedURLs:
+                    self._interface.Error(f'Failed to download a story: "{URL}".')
 
-                    newlyDownloadedStory = self._ProcessURL(URL)
+                WriteTextFile(Configuration.SkippedURLsFilePath, "\n".join(skippedURLs))
 
-                except KeyboardInterrupt:
+            # Print some final information.
 
-                    self._interface.ClearLine()
-                    self._interface.Notice("Quitting...")
+            successCount = len(URLs) - len(skippedURLs)
 
-                    exit()
+            self._interface.Comment(f"Downloaded {successCount}/{len(URLs)} stories.", section = True)
 
-                except ConnectionError as caughtException:
+            # Save downloaded stories.
 
-                    self._interface.Error(f"The website has refused connection: {caughtException}")
-                    self._interface.GrabUserAttention()
+            if self._arguments.Pack and downloadedStories:
+                self._FormatAndSaveStoryOrPackage(StoryPackage([downloadedStories[x] for x in sorted(downloadedStories)]))
 
-                except SSLError as caughtException:
+            # Wait for conversions to MOBI to finish.
 
-                    self._interface.Error(f"An SSL error has occurred: {caughtException}")
-                    self._interface.GrabUserAttention()
+            self._FinishMOBIConversions()
 
-                except CloudflareChallengeError as caughtException:
+        finally:
 
-                    self._interface.Error("A Cloudflare challenge error has occurred. Try again later.")
-                    self._interface.GrabUserAttention()
+            # Stop converting to MOBI (conversions in progress are allowed to finish).
 
-                except BaseException as caughtException:
+            self._mobiConversionPool.shutdown()
 
-                    self._interface.Error(f"An exception has been thrown: {caughtException}")
-                    self._interface.GrabUserAttention()
+            # Stop image processing.
 
-                except:
+            if self._imageProcessingPool:
+                self._imageProcessingPool.shutdown()
 
-                    self._interface.Error("An exception has been thrown.")
-                    self._interface.GrabUserAttention()
+            # Stop the LibreOffice server.
 
-            else:
+            if self._libreOfficeServer:
+                self._libreOfficeServer.Close()
 
-                sleep(Configuration.PostChapterSleepTime)
+            # Close connections.
 
-                newlyDownloadedStory = self._ProcessURL(URL)
+            SharedSessionPool.Close()
 
-            if not newlyDownloadedStory:
-                skippedURLs.append(URL)
+            # Clear the cache.
 
-            if newlyDownloadedStory:
+            if not self._arguments.PersistentCache:
+                logging.info("Deleting the cache...")
+                self._cache.Clear()
 
-                if not self._arguments.Pack:
+    def _DownloadStories(self, URLs: List[str]) -> Iterator[Tuple[int, str, Optional[Story]]]:
 
-                    if not self._arguments.Debug:
+        ##
+        #
+        # Downloads stories. Stories coming from different sites are downloaded concurrently (unless
+        # the application is running in interactive or debug mode), while the number of stories
+        # downloaded from each site at once is limited. The output of every story is printed in one
+        # block, once the story is finished.
+        #
+        # @param URLs The URLs of the stories.
+        #
+        # @return Yields (index, URL, story) tuples, in the order in which stories are finished. The
+        #         story is **None** if it has failed to download.
+        #
+        ##
 
-                        try:
+        jobCount =                                                         \
+            self._arguments.JobCount                                       \
+            if not (self._arguments.Authenticate or self._arguments.Debug) \
+            else 1
 
-                            self._FormatAndSaveStoryOrPackage(newlyDownloadedStory)
+        hostJobCount = Configuration.MaximumConcurrentStoryDownloadsPerHost
 
-                        except FileNotFoundError as caughtException:
+        if (jobCount <= 1) or (len(URLs) <= 1):
 
-                            self._interface.Error(f"A filesystem exception has occurred: {caughtException}")
-                            self._interface.GrabUserAttention()
-                            skippedURLs.append(URL)
+            for index, URL in enumerate(URLs, start = 1):
+                yield index, URL, self._DownloadStory(index, URL, len(URLs))
 
-                        except:
+            return
 
-                            self._interface.Error("An exception has been thrown.")
-                            self._interface.GrabUserAttention()
-                            skippedURLs.append(URL)
+        # Group the URLs by hostname.
 
-                    else:
+        pendingURLs = {}
 
-                        self._FormatAndSaveStoryOrPackage(newlyDownloadedStory)
+        for index, URL in enumerate(URLs, start = 1):
+            pendingURLs.setdefault(GetHostname(URL), deque()).append((index, URL))
 
-                else:
+        # Download the stories.
+
+        runningTasks = {}
+        runningTaskCounts = defaultdict(int)
 
-                    downloadedStories.append(newlyDownloadedStory)
+        output = OutputBuffer(sys.stdout)
+        sys.stdout = output
+
+        self._outputBuffer = output
+
+        # Messages logged by stories are printed along with their output, too.
+
+        rootLogger = logging.getLogger()
+        loggingHandlers = rootLogger.handlers
+
+        rootLogger.handlers = [OutputBufferLoggingHandler(output, loggingHandlers)]
+
+        executor = ThreadPoolExecutor(jobCount)
+
+        try:
+
+            while pendingURLs or runningTasks:
+
+                # Start as many stories as the limits allow, taking turns between sites.
+
+                for hostname in list(pendingURLs):
+
+                    hostURLs = pendingURLs[hostname]
+
+                    while hostURLs and (len(runningTasks) < jobCount) and (runningTaskCounts[hostname] < hostJobCount):
+
+                        index, URL = hostURLs.popleft()
+
+                        task = executor.submit(self._DownloadStoryInBackground, output, index, URL, len(URLs))
+
+                        runningTasks[task] = (index, URL, hostname)
+                        runningTaskCounts[hostname] += 1
+
+                    if not hostURLs:
+                        del pendingURLs[hostname]
+
+                # Wait for stories to finish, then print their output.
+
+                finishedTasks, _ = wait(runningTasks, return_when = FIRST_COMPLETED)
+
+                for task in sorted(finishedTasks, key = lambda x: runningTasks[x][0]):
+
+                    index, URL, hostname = runningTasks.pop(task)
+                    runningTaskCounts[hostname] -= 1
+
+                    story, printedText = task.result()
+
+                    output.Stream.write(printedText)
+                    output.Stream.flush()
+
+                    yield index, URL, story
+
+        except KeyboardInterrupt:
+
+            self._interface.ClearLine()
+            self._interface.Notice("Quitting...")
+
+            exit()
+
+        finally:
+
+            for task in runningTasks:
+                task.cancel()
+
+            executor.shutdown(wait = False)
+
+            sys.stdout = output.Stream
+            rootLogger.handlers = loggingHandlers
+
+            self._outputBuffer = None
+
+    def _DownloadStoryInBackground(
+        self,
+        output: OutputBuffer,
+        index: int,
+        URL: str,
+        URLCount: int
+    ) -> Tuple[Optional[Story], str]:
+
+        ##
+        #
+        # Downloads a story, capturing its output. Called from worker threads.
+        #
+        # @param output   The output buffer.
+        # @param index    The index of the story.
+        # @param URL      The URL of the story.
+        # @param URLCount The total number of stories.
+        #
+        # @return The story (or **None** if it has failed to download), and its captured output.
+        #
+        ##
+
+        output.Start()
+
+        try:
+
+            story = self._DownloadStory(index, URL, URLCount)
+
+        finally:
+
+            printedText = output.Stop()
+
+        return story, printedText
+
+    def _BindToOutput(self, function: Callable) -> Callable:
+
+        ##
+        #
+        # Binds a function to the captured output of the current story (if it's being captured), so
+        # that the output of worker threads calling the function is printed along with it.
+        #
+        # @param function The function.
+        #
+        # @return The bound function (or the function itself, if the output isn't being captured).
+        #
+        ##
+
+        return self._outputBuffer.Bind(function) if self._outputBuffer else function
+
+    def _DownloadStory(self, index: int, URL: str, URLCount: int) -> Optional[Story]:
+
+        ##
+        #
+        # Downloads a story, reporting any errors that occur.
+        #
+        # @param index    The index of the story.
+        # @param URL      The URL of the story.
+        # @param URLCount The total number of stories.
+        #
+        # @return The Story object if the story has been downloaded successfully, **None** otherwise.
+        #
+        ##
 
         self._interface.LineBreak()
+        self._interface.Text(f'{index}/{URLCount}: "{URL}".', section = True, bold = True)
 
-        # Print information about skipped stories.
+        newlyDownloadedStory = None
 
-        if skippedURLs:
+        if not self._arguments.Debug:
 
-            print()
+            try:
 
-            for URL in skippedURLs:
-                self._interface.Error(f'Failed to download a story: "{URL}".')
+                newlyDownloadedStory = self._ProcessURL(URL)
 
-            WriteTextFile(Configuration.SkippedURLsFilePath, "\n".join(skippedURLs))
+            except KeyboardInterrupt:
 
-        # Print some final information.
+                self._interface.ClearLine()
+                self._interface.Notice("Quitting...")
 
-        successCount = len(URLs) - len(skippedURLs)
+                exit()
 
-        self._interface.Comment(f"Downloaded {successCount}/{len(URLs)} stories.", section = True)
+            except ConnectionError as caughtException:
 
-        # Save downloaded stories.
+                self._interface.Error(f"The website has refused connection: {caughtException}")
+                self._interface.GrabUserAttention()
 
-        if self._arguments.Pack and downloadedStories:
-            self._FormatAndSaveStoryOrPackage(StoryPackage(downloadedStories))
+            except SSLError as caughtException:
 
-        # Clear the cache.
+                self._interface.Error(f"An SSL error has occurred: {caughtException}")
+                self._interface.GrabUserAttention()
 
-        if not self._arguments.PersistentCache:
-            logging.info("Deleting the cache...")
-            self._cache.Clear()
+            except CloudflareChallengeError as caughtException:
+
+                self._interface.Error("A Cloudflare challenge error has occurred. Try again later.")
+                self._interface.GrabUserAttention()
+
+            except BaseException as caughtException:
+
+                self._interface.Error(f"An exception has been thrown: {caughtException}")
+                self._interface.GrabUserAttention()
+
+            except:
+
+                self._interface.Error("An exception has been thrown.")
+                self._interface.GrabUserAttention()
+
+        else:
+
+            newlyDownloadedStory = self._ProcessURL(URL)
+
+        return newlyDownloadedStory
 
     def _ProcessURL(self, URL: str) -> Optional[Story]:
 
@@ -284,6 +535,13 @@ class Application:
 
         self._interface.Comment(f'Extractor created: "{type(extractor).__name__}".')
 
+        extractor.SetCache(self._cache)
+
+        # Wait for the site's turn (if it requires breaks between requests).
+
+        if extractor.RequiresBreaksBetweenRequests():
+            self._rateLimiter.Acquire(GetHostname(URL))
+
         # Authenticate the user (if supported by the extractor).
 
         if self._arguments.Authenticate and extractor.SupportsAuthentication():
@@ -309,49 +567,123 @@ class Application:
 
         self._PrintMetadata(extractor.Story)
 
-        # Check whether the output files already exist.
+        # Check whether the output files already exist. In update mode, the manifest saved along with
+        # them tells which chapters have been downloaded already: these are put in the cache, and only
+        # the new ones are downloaded. If the story has been updated since, the last chapter
+        # downloaded is downloaded again (it may have been edited); if chapters have been removed,
+        # the whole story is. The existing output files are kept until the new ones are saved.
 
         outputFilePaths = self._GetOutputPaths(self._arguments.Output, extractor.Story)
 
-        if (not self._arguments.Force) and all(x.is_file() for x in outputFilePaths.values()):
+        manifest = None
+
+        if self._arguments.Update and not (self._arguments.Force or self._arguments.Pack):
+            manifest = self._ReadManifest(outputFilePaths["Manifest"], extractor.Story)
+
+        if manifest:
+
+            downloadedChapterCount = len(manifest["Chapters"])
+            newChapterCount = extractor.Story.Metadata.ChapterCount - downloadedChapterCount
+
+            if (
+                (not newChapterCount) and
+                (manifest["DateUpdated"] == extractor.Story.Metadata.DateUpdated) and
+                self._AreOutputFilesPresent(outputFilePaths, self._InternallyGeneratedFormats)
+            ):
+                self._interface.Comment("This story is up to date.", section = True)
+                return True
+
+            reusedChapters = manifest["Chapters"] if (newChapterCount >= 0) else []
+
+            if reusedChapters and (manifest["DateUpdated"] != extractor.Story.Metadata.DateUpdated):
+                reusedChapters = reusedChapters[:-1]
+
+            if newChapterCount < 0:
+                self._interface.Comment("Chapters have been removed from the story: downloading it again.", section = True)
+            else:
+                self._interface.Comment(
+                    f"Updating the story: {extractor.Story.Metadata.ChapterCount - len(reusedChapters)} chapter(s) "
+                    "to download.",
+                    section = True
+                )
+
+            cacheOwnerName = extractor.Story.Metadata.URL
+
+            with self._cache.Batch():
+
+                for index, chapter in enumerate(reusedChapters, start = 1):
+                    self._cache.AddItem(cacheOwnerName, f"{index}-Title", chapter["Title"])
+                    self._cache.AddItem(cacheOwnerName, f"{index}-Content", chapter["Content"])
+
+                for index in range(len(reusedChapters) + 1, downloadedChapterCount + 1):
+                    self._cache.RemoveItem(cacheOwnerName, f"{index}-Title")
+                    self._cache.RemoveItem(cacheOwnerName, f"{index}-Content")
+
+        elif (not (self._arguments.Force or self._arguments.Pack)) and self._AreOutputFilesPresent(outputFilePaths):
             self._interface.Comment("This story has been downloaded already.", section = True)
             return True
 
         elif self._arguments.Force:
-            [x.unlink() for x in outputFilePaths.values() if x.is_file()]
+            self._DeleteOutputFiles(outputFilePaths)
 
         # Extract content.
 
         self._interface.Process("Extracting content...", section = True)
 
-        for index in range(1, extractor.Story.Metadata.ChapterCount + 1):
+        chapterCount = extractor.Story.Metadata.ChapterCount
+        cacheOwnerName = extractor.Story.Metadata.URL
 
-            # Generate cache identifiers.
+        # Retrieve cached chapters and schedule the remaining ones for download. Downloads run
+        # concurrently (if the extractor supports it), but the chapters are collected in order.
+        # Chapters located on the same page are extracted together, by a single worker.
 
-            cacheOwnerName = extractor.Story.Metadata.URL
-            cacheTitleName = f"{index}-Title"
-            cacheContentName = f"{index}-Content"
+        workerCount =                                             \
+            Configuration.MaximumConcurrentChapterDownloads       \
+            if extractor.SupportsConcurrentExtraction() else      \
+            1
 
-            # Retrieve chapter data, either from cache or by downloading it.
+        executor = ThreadPoolExecutor(max(1, workerCount))
 
-            retrievedFromCache = False
+        cachedChapters = {}
+        scheduledChapters = {}
 
-            chapter = Chapter(
-                title = Stringify(self._cache.RetrieveItem(cacheOwnerName, cacheTitleName)),
-                content = Stringify(self._cache.RetrieveItem(cacheOwnerName, cacheContentName))
-            )
+        try:
 
-            if chapter:
+            chapterGroups = defaultdict(list)
 
-                retrievedFromCache = True
+            for index in range(1, chapterCount + 1):
 
-            else:
+                chapter = Chapter(
+                    title = Stringify(self._cache.RetrieveItem(cacheOwnerName, f"{index}-Title")),
+                    content = Stringify(self._cache.RetrieveItem(cacheOwnerName, f"{index}-Content"))
+                )
+
+                if chapter:
+                    cachedChapters[index] = chapter
+                else:
+                    chapterGroups[extractor.GetChapterPageURL(index) or index].append(index)
+
+            for indices in chapterGroups.values():
+
+                future = executor.submit(self._BindToOutput(self._ExtractChapters), extractor, indices)
 
-                chapter = extractor.ExtractChapter(index)
+                for index in indices:
+                    scheduledChapters[index] = future
+
+            for index in range(1, chapterCount + 1):
+
+                # Retrieve chapter data, either from cache or from the download queue.
+
+                retrievedFromCache = index in cachedChapters
+
+                chapter =                                  \
+                    cachedChapters[index]                  \
+                    if retrievedFromCache else             \
+                    scheduledChapters[index].result()[index]
 
                 if not chapter:
 
-                    if (1 != index) and (extractor.Story.Metadata.ChapterCount != index):
+                    if (1 != index) and (chapterCount != index):
                         logging.error("Failed to extract story content.")
                         return None
 
@@ -359,29 +691,51 @@ class Application:
                         self._interface.Error("Failed to extract the last chapter - it doesn't seem to exist.")
                         continue
 
-            extractor.Story.Chapters.append(chapter)
+                extractor.Story.Chapters.append(chapter)
 
-            # Add the chapter to cache.
+                # Add the chapter to cache.
 
-            if not retrievedFromCache:
-                self._cache.AddItem(cacheOwnerName, cacheTitleName, chapter.Title)
-                self._cache.AddItem(cacheOwnerName, cacheContentName, chapter.Content)
+                if not retrievedFromCache:
 
-            # Notify the user, then sleep for a while.
+                    with self._cache.Batch():
+                        self._cache.AddItem(cacheOwnerName, f"{index}-Title", chapter.Title)
+                        self._cache.AddItem(cacheOwnerName, f"{index}-Content", chapter.Content)
 
-            self._interface.ProgressBar(
-                index,
-                extractor.Story.Metadata.ChapterCount,
-                Configuration.ProgressBarLength,
-                f"# Extracted chapter {index}/{extractor.Story.Metadata.ChapterCount}",
-                True
-            )
+                # Notify the user.
 
-            if extractor.Story.Metadata.ChapterCount == index:
-                self._interface.EmptyLine()
+                self._interface.ProgressBar(
+                    index,
+                    chapterCount,
+                    Configuration.ProgressBarLength,
+                    f"# Extracted chapter {index}/{chapterCount}",
+                    True
+                )
+
+                if chapterCount == index:
+                    self._interface.EmptyLine()
+
+        finally:
+
+            # Abandon downloads that haven't started yet (if extraction has failed).
+
+            for future in scheduledChapters.values():
+                future.cancel()
+
+            executor.shutdown()
+
+        # In update mode, prepare the manifest (containing the content as extracted, before it's
+        # processed), so that the story can be updated later. It's saved along with the output files,
+        # which replace the existing ones. Stories with missing chapters can't be updated.
 
-            if not retrievedFromCache and extractor.RequiresBreaksBetweenRequests():
-                sleep(Configuration.PostChapterSleepTime)
+        if self._arguments.Update and (not self._arguments.Pack):
+
+            manifest =                                                \
+                self._CreateManifest(extractor.Story)                 \
+                if len(extractor.Story.Chapters) == chapterCount else \
+                None
+
+            with self._pendingUpdatesLock:
+                self._pendingUpdates[extractor.Story.Metadata.URL] = manifest
 
         # Locate and download images.
 
@@ -409,58 +763,80 @@ class Application:
 
                 previousImageFailedToDownload = False
 
-                for index, image in enumerate(extractor.Story.Images, start = 1):
+                # Retrieve cached images and schedule the remaining ones for download. Downloads run
+                # concurrently (if the extractor supports it) and processing (scaling down and
+                # re-encoding) runs in separate processes, but the images are collected in order.
+
+                workerCount =                                             \
+                    Configuration.MaximumConcurrentImageDownloads         \
+                    if extractor.SupportsConcurrentExtraction() else      \
+                    1
 
-                    retrievedFromCache = False
-                    imageData = self._cache.RetrieveItem(extractor.Story.Metadata.URL, image.URL)
+                executor = ThreadPoolExecutor(max(1, workerCount))
 
-                    if not image.CreateFromData(imageData, Configuration.MaximumImageSideLength):
+                scheduledImages = {}
 
-                        imageData = extractor.ExtractMedia(image.URL)
+                try:
 
-                        if imageData:
-                            image.CreateFromData(imageData, Configuration.MaximumImageSideLength)
+                    for index, image in enumerate(extractor.Story.Images, start = 1):
 
-                    else:
+                        imageData = self._cache.RetrieveItem(extractor.Story.Metadata.URL, image.URL)
+
+                        if not image.CreateFromProcessedData(imageData):
+                            scheduledImages[index] = executor.submit(
+                                self._BindToOutput(self._DownloadImage),
+                                extractor,
+                                image
+                            )
+
+                    for index, image in enumerate(extractor.Story.Images, start = 1):
+
+                        retrievedFromCache = index not in scheduledImages
+                        imageData = scheduledImages[index].result() if not retrievedFromCache else None
 
-                        retrievedFromCache = True
+                        if image:
 
-                    if image:
+                            if not retrievedFromCache:
+                                self._cache.AddItem(
+                                    extractor.Story.Metadata.URL,
+                                    image.URL,
+                                    image.Data
+                                )
 
-                        if not retrievedFromCache:
-                            self._cache.AddItem(
-                                extractor.Story.Metadata.URL,
-                                image.URL,
-                                image.Data
+                            self._interface.ProgressBar(
+                                index,
+                                imageCount,
+                                Configuration.ProgressBarLength,
+                                f"# Downloaded image {index}/{imageCount}",
+                                True
                             )
 
-                        self._interface.ProgressBar(
-                            index,
-                            imageCount,
-                            Configuration.ProgressBarLength,
-                            f"# Downloaded image {index}/{imageCount}",
-                            True
-                        )
+                            if imageCount == index:
+                                print()
 
-                        if imageCount == index:
-                            print()
+                            downloadedImageCount += 1
+                            previousImageFailedToDownload = False
 
-                        downloadedImageCount += 1
-                        previousImageFailedToDownload = False
+                        else:
 
-                    else:
+                            if (index > 1) and (not previousImageFailedToDownload):
+                                print()
+
+                            errorMessage =                                                       \
+                                f'Failed to download image {index}/{imageCount}: "{image.URL}".' \
+                                if not imageData else                                            \
+                                f'Failed to process/re-encode image {index}/{imageCount}: "{image.URL}".'
+
+                            self._interface.Error(errorMessage)
 
-                        if (index > 1) and (not previousImageFailedToDownload):
-                            print()
+                            previousImageFailedToDownload = True
 
-                        errorMessage =                                                       \
-                            f'Failed to download image {index}/{imageCount}: "{image.URL}".' \
-                            if not imageData else                                            \
-                            f'Failed to process/re-encode image {index}/{imageCount}: "{image.URL}".'
+                finally:
 
-                        self._interface.Error(errorMessage)
+                    for future in scheduledImages.values():
+                        future.cancel()
 
-                        previousImageFailedToDownload = True
+                    executor.shutdown()
 
                 self._interface.Comment(
                     f"Successfully downloaded {downloadedImageCount}/{imageCount} image(s)."
@@ -472,6 +848,8 @@ class Application:
 
         extractor.Story.Process()
 
+        contentProcessor = ContentProcessor()
+
         for index, chapter in enumerate(extractor.Story.Chapters, start = 1):
 
             # Store original content.
@@ -486,13 +864,9 @@ class Application:
                     chapter.Content
                 )
 
-            # The sanitizer is used twice - once before any other processing, once after every other
-            # processor. The first time is required to clean up the story (remove empty tags and tag
-            # trees, for example), the second to guarantee that the story is actually sanitized.
+            # Sanitize the content and fix its typography.
 
-            chapter.Content = SanitizerProcessor().Process(chapter.Content)
-            chapter.Content = TypographyProcessor().Process(chapter.Content)
-            chapter.Content = SanitizerProcessor().Process(chapter.Content)
+            chapter.Content = contentProcessor.Process(chapter.Content)
 
             # Store processed content.
 
@@ -515,6 +889,94 @@ class Application:
 
         return extractor.Story
 
+    def _ExtractChapters(self, extractor: Extractor, indices: List[int]) -> Dict[int, Optional[Chapter]]:
+
+        ##
+        #
+        # Extracts a group of chapters located on the same page, respecting the request rate limit of
+        # the story's host (if the extractor requires breaks between requests): the page is downloaded
+        # once. Called from worker threads.
+        #
+        # @param extractor The extractor.
+        # @param indices   The indices of the chapters to be extracted.
+        #
+        # @return A dictionary mapping chapter indices to chapters (or **None**, for the chapters that
+        #         haven't been extracted correctly).
+        #
+        ##
+
+        if extractor.RequiresBreaksBetweenRequests():
+            self._rateLimiter.Acquire(GetHostname(extractor.Story.Metadata.URL))
+
+        return {index: extractor.ExtractChapter(index) for index in indices}
+
+    def _DownloadImage(self, extractor: Extractor, image: Image) -> Optional[bytes]:
+
+        ##
+        #
+        # Downloads an image and creates it from downloaded data. Called from worker threads.
+        #
+        # @param extractor The extractor.
+        # @param image     The image.
+        #
+        # @return Downloaded image data; **None** if the download has failed.
+        #
+        ##
+
+        imageData = extractor.ExtractMedia(image.URL)
+
+        if imageData:
+            self._CreateImageFromData(image, imageData)
+
+        return imageData
+
+    def _CreateImageFromData(self, image: Image, data: bytes) -> bool:
+
+        ##
+        #
+        # Creates an image from downloaded data. The processed (scaled down and re-encoded) image
+        # is cached under the hash of the downloaded data, so identical images - even if they have
+        # different URLs or come from different stories - are processed only once.
+        #
+        # @param image The image.
+        # @param data  Downloaded image data.
+        #
+        # @return **True** if the image has been created correctly, **False** otherwise.
+        #
+        ##
+
+        processedImageName = f"{Cache.GetHash(data)}-{Configuration.MaximumImageSideLength}"
+
+        processedImageData = self._cache.RetrieveItem(self._ProcessedImagesCacheOwnerName, processedImageName)
+
+        if image.CreateFromProcessedData(processedImageData):
+            return True
+
+        if not image.CreateFromData(data, Configuration.MaximumImageSideLength, executor = self._GetImageProcessingPool()):
+            return False
+
+        self._cache.AddItem(self._ProcessedImagesCacheOwnerName, processedImageName, image.Data)
+
+        return True
+
+    def _GetImageProcessingPool(self) -> ProcessPoolExecutor:
+
+        ##
+        #
+        # Returns the process pool used to process (scale down and re-encode) images, creating it if
+        # necessary. The pool is shared by all stories.
+        #
+        # @return The process pool.
+        #
+        ##
+
+        with self._imageProcessingPoolLock:
+
+            if not self._imageProcessingPool:
+                self._imageProcessingPool = ProcessPoolExecutor(Configuration.ImageProcessingProcessCount)
+
+            return self._imageProcessingPool
+
     def _FormatAndSaveStoryOrPackage(self, story: Union[Story, StoryPackage]) -> bool:
 
         # Notify the user.
@@ -531,109 +993,302 @@ class Application:
         filePaths = self._GetOutputPaths(self._arguments.Output, story)
         filePaths["Directory"].mkdir(parents = True, exist_ok = True)
 
-        # Format and save the stories to HTML.
+        # In update mode, the story is saved to a staging directory first: the existing output files
+        # (and the manifest) are replaced only once all the new ones have been saved, so that a failed
+        # update doesn't destroy them.
 
-        self._interface.Comment("Saving as HTML... ", end = "")
+        updating = False
+        manifest = None
 
-        formatter = FormatterHTML(self._arguments.Images)
-        if not filePaths["HTML"].is_file():
+        if isinstance(story, Story):
 
-            if not formatter.FormatAndSave(story, filePaths["HTML"]):
-                self._interface.Text("Failed!")
+            with self._pendingUpdatesLock:
 
-            else:
-                self._interface.Text("Done!")
+                if (updating := story.Metadata.URL in self._pendingUpdates):
+                    manifest = self._pendingUpdates.pop(story.Metadata.URL)
 
-        else:
+        if not updating:
 
-            self._interface.Text("Output file already exists.")
+            self._SaveInFormats(story, filePaths, self._outputFormats)
+            return True
 
-        # Format and save the stories to ODT.
+        with TemporaryDirectory(prefix = ".", dir = filePaths["Directory"]) as stagingDirectoryPath:
 
-        self._interface.Comment("Saving as ODT... ", end = "")
+            stagedFilePaths = {
+                name: (Path(stagingDirectoryPath) / filePath.name)
+                for name, filePath in filePaths.items()
+            }
+            stagedFilePaths["Directory"] = Path(stagingDirectoryPath)
 
-        formatter = FormatterODT(self._arguments.Images, isinstance(story, StoryPackage))
-        if not filePaths["ODT"].is_file():
+            self._SaveInFormats(story, stagedFilePaths, [x for x in self._outputFormats if "MOBI" != x])
 
-            if not formatter.FormatAndSave(story, filePaths["ODT"]):
-                self._interface.Text("Failed!")
+            if not self._AreOutputFilesPresent(stagedFilePaths, self._InternallyGeneratedFormats):
+                self._interface.Error("Failed to update the story: the existing output files have been kept.")
+                return False
 
-            else:
-                self._interface.Text("Done!")
+            for name in self._outputFormats:
 
-        else:
+                if stagedFilePaths[name].is_file():
+                    replace(stagedFilePaths[name], filePaths[name])
 
-            self._interface.Text("Output file already exists.")
+        # Save the manifest. If the story couldn't be downloaded in full, the old one no longer
+        # matches the output files.
 
-        # Format and save the stories to PDF.
+        if manifest:
+            self._WriteManifest(filePaths["Manifest"], manifest)
+        elif filePaths["Manifest"].is_file():
+            filePaths["Manifest"].unlink()
 
-        self._interface.Comment("Saving as PDF... ", end = "")
+        # Convert to MOBI (from the new EPUB file).
 
-        coverImageData = None
+        if "MOBI" in self._outputFormats:
+            self._interface.Comment(f"Saving as MOBI... {self._SaveAsMOBI(filePaths, overwrite = True)}")
 
-        formatter = FormatterPDF(self._arguments.Images)
+        return True
 
-        if not self._arguments.LibreOffice.is_file():
+    def _SaveInFormats(self, story: Union[Story, StoryPackage], filePaths: Dict, formats: List[str]) -> None:
 
-            self._interface.Text("This output format is unavailable.")
+        ##
+        #
+        # Formats the story (or the story package) and saves it in given formats. Each format is
+        # generated as soon as the formats it's converted from are ready.
+        #
+        # @param story     The story/story package.
+        # @param filePaths Output file paths, as generated by _GetOutputPaths().
+        # @param formats   The formats (including the ones the others are converted from).
+        #
+        ##
 
-        elif not filePaths["PDF"].is_file():
+        # Prepare the formatters.
 
-            if not formatter.ConvertFromODT(filePaths["ODT"], filePaths["PDF"].parent, self._arguments.LibreOffice):
-                self._interface.Text("Failed!")
+        formatterEPUB = FormatterEPUB(self._arguments.Images)
 
-            else:
-                self._interface.Text("Done!")
+        tasks = TaskGraph()
 
-        else:
+        if "HTML" in formats:
+            tasks.AddTask("HTML", lambda: self._SaveAsHTML(story, filePaths))
+
+        if "ODT" in formats:
+            tasks.AddTask("ODT", lambda: self._SaveAsODT(story, filePaths))
+
+        if "PDF" in formats:
+            tasks.AddTask("PDF", lambda: self._SaveAsPDF(filePaths), ["ODT"])
+
+        if "EPUB" in formats:
+            tasks.AddTask("EPUB Content", lambda: self._FormatAsEPUB(story, filePaths, formatterEPUB))
+            tasks.AddTask("EPUB Cover", lambda: self._RenderEPUBCover(story, filePaths, formatterEPUB))
+            tasks.AddTask("EPUB", lambda: self._SaveAsEPUB(filePaths, formatterEPUB), ["EPUB Content", "EPUB Cover"])
 
-            self._interface.Text("Output file already exists.")
+        if "MOBI" in formats:
+            tasks.AddTask("MOBI", lambda: self._SaveAsMOBI(filePaths), ["EPUB"])
 
-        if filePaths["PDF"].is_file():
-            coverImageData = RenderPDFPageToBytes(filePaths["PDF"], 0)
+        # Format and save the story.
 
-        # Format and save the stories to EPUB.
+        with ThreadPoolExecutor() as executor:
 
-        self._interface.Comment("Saving as EPUB... ", end = "")
+            for name, result in tasks.Run(executor):
+
+                if result is not None:
+                    self._interface.Comment(f"Saving as {name}... {result}")
+
+    def _SaveAsHTML(self, story: Union[Story, StoryPackage], filePaths: Dict) -> str:
+
+        ##
+        #
+        # Formats the story (or the story package) and saves it to HTML.
+        #
+        # @param story     The story/story package.
+        # @param filePaths Output file paths, as generated by _GetOutputPaths().
+        #
+        # @return The result, to be shown to the user.
+        #
+        ##
+
+        if filePaths["HTML"].is_file():
+            return "Output file already exists."
+
+        formatter = FormatterHTML(self._arguments.Images)
+
+        return "Done!" if formatter.FormatAndSave(story, filePaths["HTML"]) else "Failed!"
+
+    def _SaveAsODT(self, story: Union[Story, StoryPackage], filePaths: Dict) -> str:
+
+        ##
+        #
+        # Formats the story (or the story package) and saves it to ODT.
+        #
+        # @param story     The story/story package.
+        # @param filePaths Output file paths, as generated by _GetOutputPaths().
+        #
+        # @return The result, to be shown to the user.
+        #
+        ##
+
+        if filePaths["ODT"].is_file():
+            return "Output file already exists."
+
+        formatter = FormatterODT(self._arguments.Images, isinstance(story, StoryPackage))
+
+        return "Done!" if formatter.FormatAndSave(story, filePaths["ODT"]) else "Failed!"
+
+    def _SaveAsPDF(self, filePaths: Dict) -> str:
+
+        ##
+        #
+        # Converts the ODT file to PDF.
+        #
+        # @param filePaths Output file paths, as generated by _GetOutputPaths().
+        #
+        # @return The result, to be shown to the user.
+        #
+        ##
+
+        if not self._arguments.LibreOffice.is_file():
+            return "This output format is unavailable."
+
+        elif filePaths["PDF"].is_file():
+            return "Output file already exists."
+
+        formatter = FormatterPDF(self._arguments.Images)
+
+        if not formatter.ConvertFromODT(
+            filePaths["ODT"],
+            filePaths["PDF"].parent,
+            self._arguments.LibreOffice,
+            self._libreOfficeServer
+        ):
+            return "Failed!"
+
+        return "Done!"
+
+    def _FormatAsEPUB(self, story: Union[Story, StoryPackage], filePaths: Dict, formatter: FormatterEPUB) -> None:
+
+        ##
+        #
+        # Formats the story (or the story package) as EPUB, without saving it (the cover may not be
+        # ready yet).
+        #
+        # @param story     The story/story package.
+        # @param filePaths Output file paths, as generated by _GetOutputPaths().
+        # @param formatter The EPUB formatter.
+        #
+        ##
 
-        formatter = FormatterEPUB(self._arguments.Images, coverImageData)
         if not filePaths["EPUB"].is_file():
+            formatter.Format(story)
 
-            if not formatter.FormatAndSave(story, filePaths["EPUB"]):
-                self._interface.Text("Failed!")
+    def _RenderEPUBCover(self, story: Union[Story, StoryPackage], filePaths: Dict, formatter: FormatterEPUB) -> None:
 
-            else:
-                self._interface.Text("Done!")
+        ##
+        #
+        # Renders the cover of the EPUB file. Covers are cached under the hash of their text, so a
+        # cover is rendered again only if the metadata printed on it changes.
+        #
+        # @param story     The story/story package.
+        # @param filePaths Output file paths, as generated by _GetOutputPaths().
+        # @param formatter The EPUB formatter.
+        #
+        ##
 
-        else:
+        if filePaths["EPUB"].is_file():
+            return
 
-            self._interface.Text("Output file already exists.")
+        coverText = GetCoverText(story)
+        coverName = f"{Cache.GetHash(coverText.encode())}-{Configuration.CoverImageWidth}x{Configuration.CoverImageHeight}"
 
-        # Format and save the story to MOBI.
+        if not (coverData := self._cache.RetrieveItem(self._CoversCacheOwnerName, coverName)):
 
-        self._interface.Comment("Saving as MOBI... ", end = "")
+            coverData = RenderCoverToBytes(coverText, Configuration.CoverImageWidth, Configuration.CoverImageHeight)
+            self._cache.AddItem(self._CoversCacheOwnerName, coverName, coverData)
 
-        formatter = FormatterMOBI(self._arguments.Images)
+        formatter.CoverImageData = coverData
+
+    def _SaveAsEPUB(self, filePaths: Dict, formatter: FormatterEPUB) -> str:
+
+        ##
+        #
+        # Saves the story (or the story package), formatted by _FormatAsEPUB(), to EPUB, along with
+        # the cover rendered by _RenderEPUBCover().
+        #
+        # @param filePaths Output file paths, as generated by _GetOutputPaths().
+        # @param formatter The EPUB formatter.
+        #
+        # @return The result, to be shown to the user.
+        #
+        ##
+
+        if filePaths["EPUB"].is_file():
+            return "Output file already exists."
+
+        return "Done!" if formatter.Save(filePaths["EPUB"]) else "Failed!"
+
+    def _SaveAsMOBI(self, filePaths: Dict, overwrite: bool = False) -> str:
+
+        ##
+        #
+        # Schedules the conversion of the EPUB file to MOBI. Conversions run in the background (while
+        # next stories are being downloaded): _FinishMOBIConversions() waits for them to finish.
+        #
+        # @param filePaths Output file paths, as generated by _GetOutputPaths().
+        # @param overwrite Overwrite the existing MOBI file (if there is one).
+        #
+        # @return The result, to be shown to the user.
+        #
+        ##
 
         if not FindExecutable("ebook-convert"):
+            return "This output format is unavailable."
 
-            self._interface.Text("This output format is unavailable.")
+        elif filePaths["MOBI"].is_file() and not overwrite:
+            return "Output file already exists."
 
-        elif not filePaths["MOBI"].is_file():
+        formatter = FormatterMOBI(self._arguments.Images)
 
-            if not formatter.ConvertFromEPUB(filePaths["EPUB"], filePaths["MOBI"].parent):
-                self._interface.Text("Failed!")
+        with self._mobiConversionsLock:
 
-            else:
-                self._interface.Text("Done!")
+            self._mobiConversions.append((
+                filePaths["MOBI"],
+                self._mobiConversionPool.submit(formatter.ConvertFromEPUB, filePaths["EPUB"], filePaths["MOBI"].parent)
+            ))
 
-        else:
+        return "Scheduled."
 
-            self._interface.Text("Output file already exists.")
+    def _FinishMOBIConversions(self) -> None:
 
-        # Return.
+        ##
+        #
+        # Waits for all the scheduled conversions to MOBI to finish, and reports the ones that have
+        # failed.
+        #
+        ##
 
-        return True
+        with self._mobiConversionsLock:
+
+            conversions = self._mobiConversions
+            self._mobiConversions = []
+
+        if not conversions:
+            return
+
+        self._interface.Process("Waiting for conversions to MOBI to finish...", section = True)
+
+        failureCount = 0
+
+        for filePath, conversion in conversions:
+
+            try:
+
+                converted = conversion.result() and filePath.is_file()
+
+            except Exception:
+
+                converted = False
+
+            if not converted:
+                self._interface.Error(f'Failed to convert to MOBI: "{filePath}".')
+                failureCount += 1
+
+        self._interface.Comment(f"Converted {len(conversions) - failureCount}/{len(conversions)} file(s).")
 
     def _PrintMetadata(self, story: Story) -> None:
 
@@ -692,22 +1347,138 @@ class Application:
             "PDF"  : outputDirectoryPath / (sanitizedTitle + ".pdf" ),
             "EPUB" : outputDirectoryPath / (sanitizedTitle + ".epub"),
             "MOBI" : outputDirectoryPath / (sanitizedTitle + ".mobi"),
+            "Manifest": outputDirectoryPath / (sanitizedTitle + ".json"),
+        }
+
+    def _AreOutputFilesPresent(self, filePaths: Dict, formats: Optional[List[str]] = None) -> bool:
+
+        ##
+        #
+        # Checks whether the output files of the selected formats exist.
+        #
+        # @param filePaths Output file paths, as generated by _GetOutputPaths().
+        # @param formats   If specified, only the selected formats present in this list are checked.
+        #
+        # @return **True** if they do, **False** otherwise.
+        #
+        ##
+
+        return all(
+            filePaths[x].is_file()
+            for x in self._outputFormats
+            if (formats is None) or (x in formats)
+        )
+
+    def _DeleteOutputFiles(self, filePaths: Dict) -> None:
+
+        ##
+        #
+        # Deletes the output files of the selected formats, and the manifest. Files of other formats
+        # are left alone.
+        #
+        # @param filePaths Output file paths, as generated by _GetOutputPaths().
+        #
+        ##
+
+        for name in [*self._outputFormats, "Manifest"]:
+
+            if filePaths[name].is_file():
+                filePaths[name].unlink()
+
+    def _ReadManifest(self, filePath: Path, story: Story) -> Optional[Dict]:
+
+        ##
+        #
+        # Reads the manifest of a story downloaded already.
+        #
+        # @param filePath The path of the manifest file.
+        # @param story    The story (scanned, i.e. with its metadata retrieved).
+        #
+        # @return The manifest, or **None** if it doesn't exist, is invalid or doesn't match the story
+        #         (comes from another URL).
+        #
+        ##
+
+        if not (code := ReadTextFile(filePath)):
+            return None
+
+        try:
+
+            manifest = json.loads(code)
+
+            if (
+                (manifest["URL"] != story.Metadata.URL) or
+                (not all(chapter["Content"] for chapter in manifest["Chapters"]))
+            ):
+                return None
+
+        except (ValueError, KeyError, TypeError):
+
+            logging.error(f'Invalid manifest file: "{filePath}".')
+            return None
+
+        return manifest
+
+    def _CreateManifest(self, story: Story) -> Dict:
+
+        ##
+        #
+        # Creates the manifest of a story, i.e. a record of which chapters of the story have been
+        # downloaded (and what they contain).
+        #
+        # @param story The story (with its chapters extracted).
+        #
+        # @return The manifest.
+        #
+        ##
+
+        return {
+            "URL": story.Metadata.URL,
+            "DateUpdated": story.Metadata.DateUpdated,
+            "Chapters": [{"Title": x.Title, "Content": x.Content} for x in story.Chapters],
         }
 
+    def _WriteManifest(self, filePath: Path, manifest: Dict) -> None:
+
+        ##
+        #
+        # Writes the manifest of a story.
+        #
+        # @param filePath The path of the manifest file.
+        # @param manifest The manifest, as created by _CreateManifest().
+        #
+        ##
+
+        if not WriteTextFile(filePath, json.dumps(manifest, ensure_ascii = False)):
+            logging.error(f'Failed to write the manifest file: "{filePath}".')
+
     def _GenerateNotices(self) -> List[str]:
 
         notices = []
 
-        if not FindExecutable("ebook-convert"):
+        if ("MOBI" in self._outputFormats) and not FindExecutable("ebook-convert"):
             notices.append(
                 "\"Calibre\" doesn't seem to be installed on this machine. MOBI output files will not "
                 "be generated."
             )
 
-        if not self._arguments.LibreOffice.is_file():
+        if ("PDF" in self._outputFormats) and not self._arguments.LibreOffice.is_file():
             notices.append(
                 "\"LibreOffice\" doesn't seem to be installed on this machine. PDF output files will "
                 "not be generated."
             )
 
-        return notices
\ No newline at end of file
+        return notices
+
+    # The formats generated by the application itself (without external tools): if these files exist,
+    # a story has been saved.
+    _InternallyGeneratedFormats = ["HTML", "ODT", "EPUB"]
+
+    # The formats other formats are converted from.
+    _SourceFormats = {"PDF": "ODT", "MOBI": "EPUB"}
+
+    # The cache owner under which processed images are stored, keyed by the hash of source data.
+    _ProcessedImagesCacheOwnerName = "Processed Images"
+
+    # The cache owner under which rendered covers are stored, keyed by the hash of their text.
+    _CoversCacheOwnerName = "Covers"
\ No newline at end of file
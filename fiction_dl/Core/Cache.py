@@ -28,14 +28,18 @@
 
 # Standard packages.
 
+from contextlib import contextmanager
+from hashlib import sha256
 from pathlib import Path
-from shutil import rmtree
-from typing import Any
+import sqlite3
+from threading import local
+from time import time
+from typing import Any, Iterator, Optional, Tuple
+from xml.etree import ElementTree
+import zlib
 
 # Non-standard packages.
 
-from bs4 import BeautifulSoup
-from dreamy_utilities.Filesystem import GetUniqueFileName, ReadTextFile, WriteTextFile
 from dreamy_utilities.Text import Bytify
 
 #
@@ -50,11 +54,36 @@ from dreamy_utilities.Text import Bytify
 #
 # Represents the application's cache.
 #
+# All the items are stored in a single SQLite database, indexed by (owner, name). Every insertion is
+# committed atomically; related insertions can be grouped together using Batch().
+#
+# The data itself is content-addressed: items only point at blobs, identified by the hash of their
+# content, and every blob is stored once - no matter how many items (within one owner or across
+# many) refer to it. Blobs are reference-counted and removed when the last item referring to them
+# is.
+#
+# Data is compressed transparently whenever that makes it smaller. Every blob records the codec its
+# data has been stored with.
+#
+# The cache can be bounded: items can be given a lifetime, after which they expire, and the total
+# size of stored data can be limited. When the limit is exceeded, whole owners (i.e. stories) are
+# evicted, the least recently used ones first.
+#
+# The cache can be shared by multiple threads and multiple processes. Every thread uses its own
+# connection to the database, every batch is a write transaction (and SQLite makes sure they are
+# serialized), and no state is kept in memory: everything, including the total size of stored
+# data, is kept in the database itself.
+#
 ##
 
 class Cache:
 
-    def __init__(self, directoryPath: Path) -> None:
+    def __init__(
+        self,
+        directoryPath: Path,
+        sizeLimit: Optional[int] = None,
+        itemLifetime: Optional[float] = None
+    ) -> None:
 
         ##
         #
@@ -62,49 +91,80 @@ class Cache:
         #
         # @param directoryPath The path of the cache's directory. It will be created if necessary.
         #                      Needs to be write-able.
+        # @param sizeLimit     The maximum total size of stored data, in bytes. Unlimited if **None**.
+        # @param itemLifetime  The default lifetime of an item, in seconds. Unlimited if **None**.
         #
         ##
 
         self._directoryPath = directoryPath
-        self._items = {}
+        self._sizeLimit = sizeLimit
+        self._itemLifetime = itemLifetime
 
-        # Create the directory and attempt to read pre-existing cache.
+        self._threadData = local()
+
+        # Create the directory and the database (unless they exist already), then move the items
+        # stored by older versions of the application to the database.
 
         self._directoryPath.mkdir(parents = True, exist_ok = True)
-        self._ReadIndexFromFile()
+        self._CreateDatabase()
+
+        if (self._directoryPath / self._LegacyIndexFileName).is_file():
+            self._MigrateLegacyItems()
 
-    def AddItem(self, owner: str, name: str, data: Any) -> None:
+    def AddItem(self, owner: str, name: str, data: Any, lifetime: Optional[float] = None) -> None:
 
         ##
         #
-        # Adds an item to the cache.
+        # Adds an item to the cache. Replaces the item if it exists already.
         #
-        # @param owner The namespace.
-        # @param name  The name of the item.
-        # @param data  Data to be stored.
+        # @param owner    The namespace.
+        # @param name     The name of the item.
+        # @param data     Data to be stored.
+        # @param lifetime The lifetime of the item, in seconds. If **None**, the default lifetime
+        #                 (given to the constructor) is used.
         #
         ##
 
         if (not owner) or (not name) or (not data):
             return
 
-        if self.ContainsItem(owner, name):
-            Path(self._items[owner][name]).unlink()
+        data = Bytify(data)
+        dataHash = self.GetHash(data)
+
+        currentTime = time()
+        lifetime = lifetime or self._itemLifetime
+        expirationTime = (currentTime + lifetime) if lifetime else None
 
-        filePath = self._directoryPath / GetUniqueFileName()
-        with open(filePath, "wb") as file:
-            file.write(Bytify(data))
+        with self.Batch() as connection:
 
-        self._items.setdefault(owner, {})
-        self._items[owner][name] = filePath
+            # Store the blob, unless it's stored already.
 
-        self._SaveIndexToFile()
+            if not connection.execute("SELECT 1 FROM Blobs WHERE Hash = ?", (dataHash,)).fetchone():
 
-    def RetrieveItem(self, owner: str, name: str) -> bytes:
+                codec, encodedData = self._Encode(data)
+
+                connection.execute(
+                    "INSERT INTO Blobs (Hash, Data, Codec, Size) VALUES (?, ?, ?, ?)",
+                    (dataHash, encodedData, codec, len(encodedData))
+                )
+
+            # Point the item at the blob. The triggers take care of reference counting (and of the
+            # total size).
+
+            connection.execute(
+                "INSERT INTO Items (Owner, Name, Hash, Accessed, Expires) VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT (Owner, Name) DO UPDATE SET"
+                " Hash = excluded.Hash, Accessed = excluded.Accessed, Expires = excluded.Expires",
+                (owner, name, dataHash, currentTime, expirationTime)
+            )
+
+    def RetrieveItem(self, owner: str, name: str) -> Optional[bytes]:
 
         ##
         #
-        # Reads an item from the cache.
+        # Reads an item from the cache. The time the item has been accessed at (used to decide which
+        # owners to evict) is updated only if it's older than a few minutes, and only if no other
+        # thread or process is writing at the moment: reads don't wait for the write lock.
         #
         # @param owner The namespace.
         # @param item  The name of the item.
@@ -113,11 +173,37 @@ class Cache:
         #
         ##
 
-        if (owner not in self._items) or (name not in self._items[owner]):
+        currentTime = time()
+
+        connection = self._GetConnection()
+
+        row = connection.execute(
+            "SELECT Blobs.Data, Blobs.Codec, Items.Accessed FROM Items JOIN Blobs ON Items.Hash = Blobs.Hash"
+            " WHERE Owner = ? AND Name = ? AND (Expires IS NULL OR Expires > ?)",
+            (owner, name, currentTime)
+        ).fetchone()
+
+        if not row:
             return None
 
-        with open(self._items[owner][name], "rb") as file:
-            return file.read()
+        if (row[2] is None) or (currentTime - row[2] >= self._AccessTimeResolution):
+            self._UpdateAccessTime(connection, owner, name, currentTime)
+
+        return self._Decode(row[1], row[0])
+
+    def RemoveItem(self, owner: str, name: str) -> None:
+
+        ##
+        #
+        # Removes an item from the cache (if it's present).
+        #
+        # @param owner The namespace.
+        # @param item  The name of the item.
+        #
+        ##
+
+        with self.Batch() as connection:
+            connection.execute("DELETE FROM Items WHERE Owner = ? AND Name = ?", (owner, name))
 
     def ContainsItem(self, owner: str, name: str) -> bool:
 
@@ -132,89 +218,395 @@ class Cache:
         #
         ##
 
-        return (owner in self._items) and (name in self._items[owner])
+        row = self._GetConnection().execute(
+            "SELECT 1 FROM Items WHERE Owner = ? AND Name = ? AND (Expires IS NULL OR Expires > ?)",
+            (owner, name, time())
+        ).fetchone()
+
+        return row is not None
+
+    @contextmanager
+    def Batch(self) -> Iterator[sqlite3.Connection]:
+
+        ##
+        #
+        # Groups insertions into a single (write) transaction: either all of them are committed
+        # (when the outermost batch ends), or - if an exception is thrown - none of them are.
+        # Batches can be nested, but not shared between threads. The size limit and item lifetimes
+        # are enforced once the outermost batch ends.
+        #
+        # @return The database connection of the current thread.
+        #
+        ##
+
+        connection = self._GetConnection()
+
+        # Writers wait for each other (up to the busy timeout) when beginning the transaction, not
+        # halfway through it.
+
+        if not self._threadData.batchDepth:
+            connection.execute("BEGIN IMMEDIATE")
+
+        self._threadData.batchDepth += 1
+
+        try:
+
+            yield connection
+
+        except BaseException:
+
+            self._threadData.batchDepth -= 1
+
+            if not self._threadData.batchDepth:
+                connection.rollback()
+
+            raise
+
+        self._threadData.batchDepth -= 1
+
+        if not self._threadData.batchDepth:
+
+            try:
+
+                self._EnforceLimits(connection)
+                connection.commit()
+
+            except BaseException:
+
+                connection.rollback()
+                raise
 
     def Clear(self) -> None:
 
         ##
         #
-        # Clears the cache.
+        # Clears the cache. The database itself is preserved, so that other processes using the
+        # cache aren't affected (other than losing the items).
         #
         ##
 
-        self._items.clear()
+        with self.Batch() as connection:
+            connection.execute("DELETE FROM Items")
 
-        rmtree(self._directoryPath)
-        self._directoryPath.mkdir(parents = True, exist_ok = True)
+        # Shrink the database file. This fails if another process is using the database, which is
+        # harmless.
 
-    def _ReadIndexFromFile(self) -> None:
+        try:
+            self._GetConnection().execute("VACUUM")
+        except sqlite3.OperationalError:
+            pass
+
+    @staticmethod
+    def GetHash(data: bytes) -> str:
 
         ##
         #
-        # Reads the contents of the cache from the index file.
+        # Calculates the hash identifying given data in the cache.
+        #
+        # @param data The data.
+        #
+        # @return The hash, as a hexadecimal string.
+        #
+        ##
+
+        return sha256(data).hexdigest()
+
+    def _UpdateAccessTime(self, connection: sqlite3.Connection, owner: str, name: str, accessTime: float) -> None:
+
+        ##
+        #
+        # Updates the time an item has been accessed at. Inside a batch, the update becomes a part of
+        # it; otherwise it's performed on its own, without waiting for the write lock, and skipped if
+        # the database is busy.
+        #
+        # @param connection The database connection of the current thread.
+        # @param owner      The namespace.
+        # @param name       The name of the item.
+        # @param accessTime The time of the access.
         #
         ##
 
-        code = ReadTextFile(self._directoryPath / self._IndexFileName)
-        if not code:
+        query = "UPDATE Items SET Accessed = ? WHERE Owner = ? AND Name = ?"
+
+        if self._threadData.batchDepth:
+            connection.execute(query, (accessTime, owner, name))
             return
 
-        soup = BeautifulSoup(code, "xml")
+        connection.execute("PRAGMA busy_timeout = 0")
+
+        try:
+
+            connection.execute(query, (accessTime, owner, name))
+
+        except sqlite3.OperationalError:
+
+            # The database is locked by a writer: the access time is updated on some other read.
+
+            pass
+
+        finally:
+
+            connection.execute(f"PRAGMA busy_timeout = {int(self._BusyTimeout * 1000)}")
 
-        indexNode = soup.find("Index")
-        if not indexNode:
+    def _GetConnection(self) -> sqlite3.Connection:
+
+        ##
+        #
+        # Returns the database connection of the current thread, opening it if necessary.
+        #
+        # @return The connection.
+        #
+        ##
+
+        if (connection := getattr(self._threadData, "connection", None)):
+            return connection
+
+        # Transactions are managed explicitly (see Batch()), hence the "isolation_level".
+
+        connection = sqlite3.connect(
+            self._directoryPath / self._DatabaseFileName,
+            timeout = self._BusyTimeout,
+            isolation_level = None
+        )
+
+        # The write-ahead log lets readers and a writer work simultaneously, and makes commits cheap
+        # enough to perform one per batch.
+
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+
+        self._threadData.connection = connection
+        self._threadData.batchDepth = 0
+
+        return connection
+
+    def _CreateDatabase(self) -> None:
+
+        ##
+        #
+        # Creates the database tables (unless they exist already).
+        #
+        ##
+
+        with self.Batch() as connection:
+
+            # Create the tables.
+
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS Blobs ("
+                "    Hash TEXT NOT NULL PRIMARY KEY,"
+                "    Data BLOB NOT NULL,"
+                "    Codec TEXT NOT NULL,"
+                "    Size INTEGER NOT NULL,"
+                "    ReferenceCount INTEGER NOT NULL DEFAULT 0"
+                ")"
+            )
+
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS Items ("
+                "    Owner TEXT NOT NULL,"
+                "    Name TEXT NOT NULL,"
+                "    Hash TEXT NOT NULL,"
+                "    Accessed REAL NOT NULL,"
+                "    Expires REAL,"
+                "    PRIMARY KEY (Owner, Name)"
+                ")"
+            )
+
+            connection.execute("CREATE TABLE IF NOT EXISTS Statistics (TotalSize INTEGER NOT NULL)")
+
+            if not connection.execute("SELECT 1 FROM Statistics").fetchone():
+                connection.execute("INSERT INTO Statistics SELECT COALESCE(SUM(Size), 0) FROM Blobs")
+
+            # Create the triggers, maintaining reference counts and the total size.
+
+            connection.execute(
+                "CREATE TRIGGER IF NOT EXISTS ItemInserted AFTER INSERT ON Items BEGIN"
+                "    UPDATE Blobs SET ReferenceCount = ReferenceCount + 1 WHERE Hash = NEW.Hash;"
+                " END"
+            )
+
+            connection.execute(
+                "CREATE TRIGGER IF NOT EXISTS ItemUpdated AFTER UPDATE OF Hash ON Items"
+                " WHEN OLD.Hash != NEW.Hash BEGIN"
+                "    UPDATE Blobs SET ReferenceCount = ReferenceCount + 1 WHERE Hash = NEW.Hash;"
+                "    UPDATE Blobs SET ReferenceCount = ReferenceCount - 1 WHERE Hash = OLD.Hash;"
+                "    DELETE FROM Blobs WHERE Hash = OLD.Hash AND ReferenceCount <= 0;"
+                " END"
+            )
+
+            connection.execute(
+                "CREATE TRIGGER IF NOT EXISTS ItemDeleted AFTER DELETE ON Items BEGIN"
+                "    UPDATE Blobs SET ReferenceCount = ReferenceCount - 1 WHERE Hash = OLD.Hash;"
+                "    DELETE FROM Blobs WHERE Hash = OLD.Hash AND ReferenceCount <= 0;"
+                " END"
+            )
+
+            connection.execute(
+                "CREATE TRIGGER IF NOT EXISTS BlobInserted AFTER INSERT ON Blobs BEGIN"
+                "    UPDATE Statistics SET TotalSize = TotalSize + NEW.Size;"
+                " END"
+            )
+
+            connection.execute(
+                "CREATE TRIGGER IF NOT EXISTS BlobDeleted AFTER DELETE ON Blobs BEGIN"
+                "    UPDATE Statistics SET TotalSize = TotalSize - OLD.Size;"
+                " END"
+            )
+
+            # Remove expired items.
+
+            self._RemoveExpiredItems(connection)
+
+    def _MigrateLegacyItems(self) -> None:
+
+        ##
+        #
+        # Moves the items stored by older versions of the application (every item in a separate
+        # file, listed in an XML index) to the database, then removes the old files. Items whose
+        # files are missing are skipped.
+        #
+        ##
+
+        indexFilePath = self._directoryPath / self._LegacyIndexFileName
+
+        try:
+            ownerNodes = ElementTree.parse(indexFilePath).getroot().findall("Owner")
+        except (ElementTree.ParseError, OSError):
+            ownerNodes = []
+
+        itemFilePaths = []
+
+        with self.Batch():
+
+            for ownerNode in ownerNodes:
+
+                owner = ownerNode.findtext("Name")
+
+                for itemNode in ownerNode.iterfind("Items/*"):
+
+                    # Item files are stored in the cache directory (which may have been moved since).
+
+                    itemFilePath = self._directoryPath / Path(itemNode.findtext("Value") or "").name
+
+                    if not itemFilePath.is_file():
+                        continue
+
+                    self.AddItem(owner, itemNode.findtext("Name"), itemFilePath.read_bytes())
+                    itemFilePaths.append(itemFilePath)
+
+        for filePath in [*itemFilePaths, indexFilePath]:
+            filePath.unlink(missing_ok = True)
+
+    def _EnforceLimits(self, connection: sqlite3.Connection) -> None:
+
+        ##
+        #
+        # If the cache is too large, removes expired items, then evicts the least recently used
+        # owners until the cache fits within the size limit again. The most recently used owner is
+        # never evicted. Has to be called within a transaction.
+        #
+        # @param connection The database connection.
+        #
+        ##
+
+        if (self._sizeLimit is None) or (self._GetTotalSize(connection) <= self._sizeLimit):
             return
 
-        for ownerNode in indexNode.find_all(recursive = False):
+        self._RemoveExpiredItems(connection)
 
-            ownerName = ownerNode.find("Name").get_text()
-            self._items[ownerName] = {}
+        owners = connection.execute(
+            "SELECT Owner FROM Items GROUP BY Owner ORDER BY MAX(Accessed)"
+        ).fetchall()
 
-            for itemNode in ownerNode.find("Items").find_all(recursive = False):
+        for (owner,) in owners[:-1]:
 
-                itemName = itemNode.find("Name").get_text()
-                itemValue = itemNode.find("Value").get_text()
+            if self._GetTotalSize(connection) <= self._sizeLimit:
+                break
 
-                self._items[ownerName][itemName] = itemValue
+            connection.execute("DELETE FROM Items WHERE Owner = ?", (owner,))
 
-    def _SaveIndexToFile(self) -> None:
+    @staticmethod
+    def _RemoveExpiredItems(connection: sqlite3.Connection) -> None:
 
         ##
         #
-        # Saves the index to the index file.
+        # Removes expired items. Has to be called within a transaction.
+        #
+        # @param connection The database connection.
         #
         ##
 
-        soup = BeautifulSoup(features = "xml")
+        connection.execute(
+            "DELETE FROM Items WHERE Expires IS NOT NULL AND Expires <= ?",
+            (time(),)
+        )
+
+    @staticmethod
+    def _GetTotalSize(connection: sqlite3.Connection) -> int:
 
-        indexNode = soup.new_tag("Index")
-        soup.append(indexNode)
+        ##
+        #
+        # Returns the total size of stored data.
+        #
+        # @param connection The database connection.
+        #
+        # @return The size, in bytes.
+        #
+        ##
 
-        for ownerName, itemDictionary in self._items.items():
+        return connection.execute("SELECT TotalSize FROM Statistics").fetchone()[0]
 
-            ownerNode = soup.new_tag("Owner")
-            indexNode.append(ownerNode)
+    @staticmethod
+    def _Encode(data: bytes) -> Tuple[str, bytes]:
 
-            ownerNameNode = soup.new_tag("Name")
-            ownerNameNode.string = ownerName
-            ownerNode.append(ownerNameNode)
+        ##
+        #
+        # Compresses data, unless compression doesn't make it any smaller (as is the case with
+        # images, for example).
+        #
+        # @param data The data to be stored.
+        #
+        # @return A tuple consisting of the name of the codec used and the encoded data.
+        #
+        ##
+
+        compressedData = zlib.compress(data, Cache._CompressionLevel)
+
+        if len(compressedData) >= len(data):
+            return ("raw", data)
+
+        return ("zlib", compressedData)
+
+    @staticmethod
+    def _Decode(codec: str, data: bytes) -> Optional[bytes]:
+
+        ##
+        #
+        # Decodes stored data.
+        #
+        # @param codec The name of the codec the data has been encoded with.
+        # @param data  The encoded data.
+        #
+        # @return The decoded data, or **None** if the codec is unknown.
+        #
+        ##
 
-            ownerItemsNode = soup.new_tag("Items")
-            ownerNode.append(ownerItemsNode)
+        if "raw" == codec:
+            return data
 
-            for name, value in itemDictionary.items():
+        elif "zlib" == codec:
+            return zlib.decompress(data)
 
-                itemNode = soup.new_tag("Item")
-                ownerItemsNode.append(itemNode)
+        return None
 
-                nameNode = soup.new_tag("Name")
-                nameNode.string = name
-                itemNode.append(nameNode)
+    _DatabaseFileName = "Cache.sqlite"
+    _LegacyIndexFileName = "Index.xml"
 
-                valueNode = soup.new_tag("Value")
-                valueNode.string = str(value)
-                itemNode.append(valueNode)
+    _CompressionLevel = 6
 
-        WriteTextFile(self._directoryPath / self._IndexFileName, str(soup))
+    # How long to wait for other threads/processes to finish writing, in seconds.
+    _BusyTimeout = 60.0
 
-    _IndexFileName = "Index.xml"
\ No newline at end of file
+    # How old the access time of an item has to be to be updated when the item is read, in seconds.
+    _AccessTimeResolution = 300.0
\ No newline at end of file
@@ -0,0 +1,242 @@
+####
+#
+# fiction-dl
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Application.
+
+from fiction_dl.Core.Cache import Cache
+from fiction_dl.Core.SessionPool import SharedSessionPool
+
+# Standard packages.
+
+from requests import Session
+from typing import Optional, Union
+
+# Non-standard packages.
+
+from bs4 import BeautifulSoup
+from dreamy_utilities.Text import Stringify
+from dreamy_utilities.Web import GetHostname
+from dreamy_utilities.WebSession import DEFAULT_TAG_PARSER, DEFAULT_TEXT_ENCODING, WebSession
+
+#
+#
+#
+# Classes.
+#
+#
+#
+
+##
+#
+# A web session capable of sending conditional requests. The content of pages requested
+# conditionally is stored in the cache, along with their validators (the "ETag" and "Last-Modified"
+# headers), and the next request for the same page asks the server to send it only if it has changed. If it hasn't (the
+# server responds with "304 Not Modified"), the content is retrieved from the cache.
+#
+# The session doesn't own a connection: requests are sent using the sessions of the shared pool (one
+# per host), so that connections and cookies are reused across extractors and stories.
+#
+##
+
+class ConditionalWebSession(WebSession):
+
+    def __init__(
+        self,
+        userAgent: str = "",
+        useCloudscraper: bool = False,
+        cache: Optional[Cache] = None
+    ) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        # @param userAgent       The user-agent to be used.
+        # @param useCloudscraper Should the cloudscraper be used instead of ordinary session?
+        # @param cache           The cache used to store pages and their validators. If **None**,
+        #                        requests are never conditional.
+        #
+        ##
+
+        super().__init__(userAgent, useCloudscraper)
+
+        self.Cache = cache
+
+    def EnableCloudscraper(self, enable: bool = True):
+
+        ##
+        #
+        # Enables/disabled the cloudscraper.
+        #
+        # @param enable Enable the cloudscraper?
+        #
+        ##
+
+        self._useCloudscraper = enable
+
+    def Get(
+        self,
+        URL: str,
+        text: bool = True,
+        textEncoding: str = DEFAULT_TEXT_ENCODING,
+        stream: bool = False,
+        conditional: bool = False
+    ) -> Optional[Union[bytes, str]]:
+
+        ##
+        #
+        # Retrieves data using a GET request.
+        #
+        # @param URL          The URL.
+        # @param text         Should the response be converted to text?
+        # @param textEncoding The text encoding to be used during the conversion.
+        # @param stream       Read data stream.
+        # @param conditional  Request the page conditionally (if the cache is available)? Applies to
+        #                     text only. The page is stored in the cache, so use it only for pages
+        #                     worth it.
+        #
+        # @return Retrieved response (as *bytes* or *str*), or **None**.
+        #
+        ##
+
+        isConditional = conditional and (self.Cache is not None) and text
+
+        # Prepare the headers.
+
+        requestHeaders = {}
+        cachedContent = None
+
+        if isConditional:
+
+            cachedContent = self.Cache.RetrieveItem(URL, self._ContentItemName)
+            validators = Stringify(self.Cache.RetrieveItem(URL, self._ValidatorsItemName)).split("\n")
+
+            if cachedContent and (2 == len(validators)):
+
+                entityTag, lastModificationDate = validators
+
+                if entityTag:
+                    requestHeaders["If-None-Match"] = entityTag
+
+                if lastModificationDate:
+                    requestHeaders["If-Modified-Since"] = lastModificationDate
+
+        # Send the request.
+
+        response = self._GetSession(URL).get(URL, headers = requestHeaders, stream = stream)
+
+        if (response is not None) and (304 == response.status_code) and cachedContent:
+            return Stringify(cachedContent, encoding = textEncoding)
+
+        if (not response) or (200 != response.status_code):
+            return None
+
+        # Store the content and its validators (if there are any).
+
+        entityTag = response.headers.get("ETag", "")
+        lastModificationDate = response.headers.get("Last-Modified", "")
+
+        if isConditional and (entityTag or lastModificationDate):
+
+            with self.Cache.Batch():
+                self.Cache.AddItem(URL, self._ContentItemName, response.content)
+                self.Cache.AddItem(URL, self._ValidatorsItemName, f"{entityTag}\n{lastModificationDate}")
+
+        # Return.
+
+        return Stringify(response.content, encoding = textEncoding) if text else response.content
+
+    def GetSoup(
+        self,
+        URL: str,
+        parser: str = DEFAULT_TAG_PARSER,
+        conditional: bool = False
+    ) -> Optional[BeautifulSoup]:
+
+        ##
+        #
+        # Retrieves tag soup using a GET request.
+        #
+        # @param URL         The URL.
+        # @param parser      The tag parser to be used.
+        # @param conditional Request the page conditionally (see Get())?
+        #
+        # @return Retrieved tag soup, or **None**.
+        #
+        ##
+
+        data = self.Get(URL, conditional = conditional)
+        if not data:
+            return None
+
+        return BeautifulSoup(data, features = parser)
+
+    def Post(
+        self,
+        URL: str,
+        payload,
+        text: bool = True,
+        textEncoding: str = DEFAULT_TEXT_ENCODING
+    ) -> Optional[Union[bytes, str]]:
+
+        ##
+        #
+        # Posts some data and receives the response.
+        #
+        # @param URL          The URL.
+        # @param payload      The data to be posted.
+        # @param text         Should the response be converted to text?
+        # @param textEncoding The text encoding to be used during the conversion.
+        #
+        # @return Retrieved response (as *bytes* or *str*), or **None**.
+        #
+        ##
+
+        response = self._GetSession(URL).post(URL, data = payload)
+        if (not response) or (200 != response.status_code):
+            return None
+
+        return Stringify(response.content, encoding = textEncoding) if text else response.content
+
+    def _GetSession(self, URL: str) -> Session:
+
+        ##
+        #
+        # Retrieves the session (from the shared pool) used to send requests to given URL.
+        #
+        # @param URL The URL.
+        #
+        # @return The session.
+        #
+        ##
+
+        return SharedSessionPool.GetSession(GetHostname(URL), self._userAgent, self._useCloudscraper)
+
+    # The names of the cache items storing pages and their validators (owned by the URLs of the pages).
+    _ContentItemName = "Conditional Request Content"
+    _ValidatorsItemName = "Conditional Request Validators"
\ No newline at end of file
@@ -0,0 +1,350 @@
+####
+#
+# fiction-dl
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Application.
+
+import fiction_dl.Configuration as Configuration
+
+# Standard packages.
+
+import logging
+from pathlib import Path
+import socket
+from subprocess import DEVNULL, Popen, TimeoutExpired
+from tempfile import TemporaryDirectory
+from threading import Lock
+from time import monotonic, sleep
+from typing import Any, Optional
+
+# Non-standard packages.
+
+from dreamy_utilities.Text import Stringify
+
+# LibreOffice's Python bindings are optional: they come with LibreOffice, and are importable only by
+# the Python interpreter it's been built with.
+
+try:
+
+    import uno
+    from com.sun.star.beans import PropertyValue
+
+except ImportError:
+
+    uno = None
+
+#
+#
+#
+# Classes.
+#
+#
+#
+
+##
+#
+# A headless LibreOffice instance, kept running in the background and controlled over a UNO socket.
+# Converting documents this way avoids starting LibreOffice for every single one of them. The
+# instance is started on first use, and restarted whenever it stops responding. If it fails to
+# start, the server is not used anymore. Thread-safe (but conversions are performed one at a time).
+#
+##
+
+class LibreOfficeServer:
+
+    def __init__(self, executablePath: Path) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        # @param executablePath Path to the LibreOffice executable (soffice.exe/soffice).
+        #
+        ##
+
+        self._executablePath = executablePath
+
+        self._lock = Lock()
+
+        self._process: Optional[Popen] = None
+        self._profileDirectory: Optional[TemporaryDirectory] = None
+        self._desktop: Any = None
+        self._startFailed = False
+
+    @staticmethod
+    def IsAvailable() -> bool:
+
+        ##
+        #
+        # Checks whether LibreOffice's Python bindings (required to control the server) are available.
+        #
+        # @return **True** if they are, **False** otherwise.
+        #
+        ##
+
+        return uno is not None
+
+    def ConvertToPDF(self, sourceFilePath: Path, outputFilePath: Path) -> bool:
+
+        ##
+        #
+        # Converts a document to a PDF file. The output file may exist: it will be overwritten if it
+        # does. If the conversion fails, the server is restarted and the conversion is attempted once
+        # more. Fails immediately if the server has failed to start before.
+        #
+        # @param sourceFilePath Path to the source document.
+        # @param outputFilePath Path to the output file.
+        #
+        # @return **True** if the conversion has been performed successfully, **False** otherwise.
+        #
+        ##
+
+        if not self.IsAvailable():
+            return False
+
+        with self._lock:
+
+            if self._startFailed:
+                return False
+
+            for _ in range(2):
+
+                if not self._IsRunning() and not self._Start():
+
+                    self._startFailed = True
+                    return False
+
+                try:
+
+                    self._Convert(sourceFilePath, outputFilePath)
+                    return True
+
+                except Exception as caughtException:
+
+                    logging.info(f"LibreOffice has failed to convert a document: {caughtException}")
+                    self._Stop()
+
+        return False
+
+    def Close(self) -> None:
+
+        ##
+        #
+        # Stops the server (if it's running).
+        #
+        ##
+
+        with self._lock:
+            self._Stop()
+
+    def _Convert(self, sourceFilePath: Path, outputFilePath: Path) -> None:
+
+        ##
+        #
+        # Converts a document to a PDF file, using the running server.
+        #
+        # @param sourceFilePath Path to the source document.
+        # @param outputFilePath Path to the output file.
+        #
+        ##
+
+        document = self._desktop.loadComponentFromURL(
+            uno.systemPathToFileUrl(Stringify(sourceFilePath.absolute())),
+            "_blank",
+            0,
+            (PropertyValue(Name = "Hidden", Value = True),)
+        )
+
+        if document is None:
+            raise RuntimeError(f'Failed to load the document: "{sourceFilePath}".')
+
+        try:
+
+            document.storeToURL(
+                uno.systemPathToFileUrl(Stringify(outputFilePath.absolute())),
+                (PropertyValue(Name = "FilterName", Value = "writer_pdf_Export"),)
+            )
+
+        finally:
+
+            document.close(True)
+
+    def _IsRunning(self) -> bool:
+
+        ##
+        #
+        # Checks whether the server is running and responding.
+        #
+        # @return **True** if it is, **False** otherwise.
+        #
+        ##
+
+        if (self._process is None) or (self._process.poll() is not None) or (self._desktop is None):
+            return False
+
+        try:
+
+            self._desktop.getComponents()
+            return True
+
+        except Exception:
+
+            return False
+
+    def _Start(self) -> bool:
+
+        ##
+        #
+        # (Re)starts the server and connects to it.
+        #
+        # @return **True** if the server has been started successfully, **False** otherwise.
+        #
+        ##
+
+        self._Stop()
+
+        if not self._executablePath.is_file():
+            return False
+
+        # Start LibreOffice. It uses a profile of its own, so that it doesn't interfere with instances
+        # started by the user.
+
+        port = self._GetFreePort()
+
+        self._profileDirectory = TemporaryDirectory()
+        profileURL = Path(self._profileDirectory.name).absolute().as_uri()
+
+        self._process = Popen(
+            [
+                Stringify(self._executablePath),
+                "--headless",
+                "--invisible",
+                "--nologo",
+                "--nodefault",
+                "--norestore",
+                f"-env:UserInstallation={profileURL}",
+                f"--accept=socket,host=localhost,port={port};urp;StarOffice.ComponentContext",
+            ],
+            stdout = DEVNULL,
+            stderr = DEVNULL
+        )
+
+        # Connect to it.
+
+        localContext = uno.getComponentContext()
+        resolver = localContext.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver",
+            localContext
+        )
+
+        deadline = monotonic() + Configuration.LibreOfficeServerStartupTimeout
+
+        while (monotonic() < deadline) and (self._process.poll() is None):
+
+            try:
+
+                context = resolver.resolve(f"uno:socket,host=localhost,port={port};urp;StarOffice.ComponentContext")
+                self._desktop = context.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", context)
+
+                return True
+
+            except Exception:
+
+                sleep(self._ConnectionAttemptWait)
+
+        logging.info("Failed to start the LibreOffice server.")
+        self._Stop()
+
+        return False
+
+    def _Stop(self) -> None:
+
+        ##
+        #
+        # Stops the server (if it's running) and removes its profile.
+        #
+        ##
+
+        terminated = False
+
+        if self._desktop is not None:
+
+            try:
+                terminated = self._desktop.terminate()
+            except Exception:
+                pass
+
+            self._desktop = None
+
+        if self._process is not None:
+
+            if not terminated:
+                self._process.terminate()
+
+            try:
+
+                self._process.wait(self._TerminationTimeout)
+
+            except TimeoutExpired:
+
+                self._process.kill()
+                self._process.wait()
+
+            self._process = None
+
+        if self._profileDirectory is not None:
+
+            try:
+                self._profileDirectory.cleanup()
+            except OSError:
+                pass
+
+            self._profileDirectory = None
+
+    @staticmethod
+    def _GetFreePort() -> int:
+
+        ##
+        #
+        # Finds a free TCP port.
+        #
+        # @return The port number.
+        #
+        ##
+
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as temporarySocket:
+
+            temporarySocket.bind(("localhost", 0))
+            return temporarySocket.getsockname()[1]
+
+    # The time to wait between attempts to connect to a starting server, in seconds.
+
+    _ConnectionAttemptWait = 0.25
+
+    # The time given to the server to quit, before it's killed, in seconds.
+
+    _TerminationTimeout = 10.0
\ No newline at end of file
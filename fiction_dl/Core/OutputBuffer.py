@@ -0,0 +1,186 @@
+####
+#
+# fiction-dl
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Standard packages.
+
+from io import StringIO
+from threading import local
+from typing import Callable, Optional, TextIO
+
+#
+#
+#
+# Classes.
+#
+#
+#
+
+##
+#
+# A replacement for the standard output stream, capable of capturing the output of selected
+# threads. Used to print the output of concurrently processed stories in coherent blocks. Output of
+# threads that aren't being captured is passed through to the original stream.
+#
+##
+
+class OutputBuffer:
+
+    def __init__(self, stream: TextIO) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        # @param stream The original stream.
+        #
+        ##
+
+        self.Stream = stream
+
+        self._threadData = local()
+
+    def Start(self) -> None:
+
+        ##
+        #
+        # Starts capturing the output of the current thread.
+        #
+        ##
+
+        self._threadData.Buffer = StringIO()
+
+    def Stop(self) -> str:
+
+        ##
+        #
+        # Stops capturing the output of the current thread.
+        #
+        # @return The captured output.
+        #
+        ##
+
+        buffer = self._GetBuffer()
+        self._threadData.Buffer = None
+
+        return buffer.getvalue() if (buffer is not None) else ""
+
+    def Bind(self, function: Callable) -> Callable:
+
+        ##
+        #
+        # Binds a function to the buffer of the current thread: the function's output is captured by
+        # it, whichever thread the function is called from.
+        #
+        # @param function The function.
+        #
+        # @return The bound function.
+        #
+        ##
+
+        buffer = self._GetBuffer()
+
+        def BoundFunction(*arguments, **keywordArguments):
+
+            previousBuffer = self._GetBuffer()
+            self._threadData.Buffer = buffer
+
+            try:
+
+                return function(*arguments, **keywordArguments)
+
+            finally:
+
+                self._threadData.Buffer = previousBuffer
+
+        return BoundFunction
+
+    def IsCapturing(self) -> bool:
+
+        ##
+        #
+        # Checks whether the output of the current thread is being captured.
+        #
+        # @return **True** if it is, **False** otherwise.
+        #
+        ##
+
+        return self._GetBuffer() is not None
+
+    def write(self, text: str) -> int:
+
+        ##
+        #
+        # Writes text to the stream.
+        #
+        # @param text The text.
+        #
+        # @return The number of characters written.
+        #
+        ##
+
+        if (buffer := self._GetBuffer()) is not None:
+            return buffer.write(text)
+
+        return self.Stream.write(text)
+
+    def flush(self) -> None:
+
+        ##
+        #
+        # Flushes the stream.
+        #
+        ##
+
+        if self._GetBuffer() is None:
+            self.Stream.flush()
+
+    def __getattr__(self, name: str):
+
+        ##
+        #
+        # Forwards access to any other attribute to the original stream.
+        #
+        # @param name The name of the attribute.
+        #
+        # @return The attribute.
+        #
+        ##
+
+        return getattr(self.Stream, name)
+
+    def _GetBuffer(self) -> Optional[StringIO]:
+
+        ##
+        #
+        # Returns the buffer of the current thread.
+        #
+        # @return The buffer, or **None** if the output of current thread isn't being captured.
+        #
+        ##
+
+        return getattr(self._threadData, "Buffer", None)
\ No newline at end of file
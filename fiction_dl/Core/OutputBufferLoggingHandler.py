@@ -0,0 +1,93 @@
+####
+#
+# fiction-dl
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Application.
+
+from fiction_dl.Core.OutputBuffer import OutputBuffer
+
+# Standard packages.
+
+import logging
+from typing import List
+
+#
+#
+#
+# Classes.
+#
+#
+#
+
+##
+#
+# A logging handler sending the records logged by threads whose output is being captured by an
+# output buffer to that buffer, so that they're printed along with the rest of the output of these
+# threads. Other records are passed to the original handlers. Formatting and levels of the original
+# handlers are respected in both cases.
+#
+##
+
+class OutputBufferLoggingHandler(logging.Handler):
+
+    def __init__(self, output: OutputBuffer, handlers: List[logging.Handler]) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        # @param output   The output buffer.
+        # @param handlers The original handlers.
+        #
+        ##
+
+        super().__init__()
+
+        self._output = output
+        self._handlers = handlers
+
+    def emit(self, record: logging.LogRecord) -> None:
+
+        ##
+        #
+        # Handles a record.
+        #
+        # @param record The record.
+        #
+        ##
+
+        if not self._output.IsCapturing():
+
+            for handler in self._handlers:
+                handler.handle(record)
+
+            return
+
+        for handler in self._handlers:
+
+            if record.levelno >= handler.level:
+                self._output.write(handler.format(record) + "\n")
\ No newline at end of file
@@ -0,0 +1,98 @@
+####
+#
+# fiction-dl
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Standard packages.
+
+from threading import Lock
+from time import monotonic, sleep
+from typing import Dict, List
+
+#
+#
+#
+# Classes.
+#
+#
+#
+
+##
+#
+# Limits the rate of requests sent to each host, using a token bucket per host. Thread-safe.
+#
+##
+
+class RateLimiter:
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        # @param rate  The maximum number of requests per second, per host.
+        # @param burst The number of requests that can be sent to a host at once, after a period
+        #              of inactivity.
+        #
+        ##
+
+        self._rate = rate
+        self._burst = max(1, burst)
+
+        self._lock = Lock()
+        self._buckets: Dict[str, List[float]] = {}
+
+    def Acquire(self, hostname: str) -> None:
+
+        ##
+        #
+        # Waits until a request can be sent to given host, then reserves it.
+        #
+        # @param hostname The hostname.
+        #
+        ##
+
+        if self._rate <= 0:
+            return
+
+        with self._lock:
+
+            currentTime = monotonic()
+
+            # Every bucket is a [token count, time of the last refill] pair. The token count may
+            # drop below zero: that means requests have been reserved, and are waiting.
+
+            bucket = self._buckets.setdefault(hostname, [self._burst, currentTime])
+
+            bucket[0] = min(self._burst, bucket[0] + (currentTime - bucket[1]) * self._rate)
+            bucket[1] = currentTime
+            bucket[0] -= 1
+
+            waitTime = max(0.0, -bucket[0] / self._rate)
+
+        if waitTime:
+            sleep(waitTime)
\ No newline at end of file
@@ -0,0 +1,135 @@
+####
+#
+# fiction-dl
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Application.
+
+import fiction_dl.Configuration as Configuration
+
+# Standard packages.
+
+from requests import Session
+from requests.adapters import DEFAULT_POOLSIZE
+from threading import Lock
+from typing import Dict, Tuple
+
+# Non-standard packages.
+
+import cloudscraper
+
+#
+#
+#
+# Classes.
+#
+#
+#
+
+##
+#
+# A pool of web sessions, one per host, shared by the whole application. Sessions keep connections
+# alive (and TLS sessions, and cookies), so subsequent requests sent to the same host - by any
+# extractor, for any story - skip the handshakes. The number of connections kept open to a host is
+# bounded: when all of them are in use, requests wait for one to become free. Thread-safe.
+#
+##
+
+class SessionPool:
+
+    def __init__(self, maximumConnectionCount: int) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        # @param maximumConnectionCount The maximum number of connections kept open to a single host.
+        #
+        ##
+
+        self._maximumConnectionCount = max(1, maximumConnectionCount)
+
+        self._lock = Lock()
+        self._sessions: Dict[Tuple[str, bool], Session] = {}
+
+    def GetSession(self, hostname: str, userAgent: str, useCloudscraper: bool = False) -> Session:
+
+        ##
+        #
+        # Retrieves the session used to send requests to given host, creating it if necessary.
+        #
+        # @param hostname        The hostname.
+        # @param userAgent       The user-agent to be used, if the session is to be created. Existing
+        #                        sessions keep theirs (cookies may be bound to it).
+        # @param useCloudscraper Should the cloudscraper be used instead of ordinary session? Hosts
+        #                        have separate sessions of both kinds.
+        #
+        # @return The session.
+        #
+        ##
+
+        with self._lock:
+
+            if (session := self._sessions.get((hostname, useCloudscraper))) is not None:
+                return session
+
+            session = cloudscraper.CloudScraper() if useCloudscraper else Session()
+            session.headers["User-Agent"] = userAgent
+
+            for adapter in session.adapters.values():
+                adapter.init_poolmanager(DEFAULT_POOLSIZE, self._maximumConnectionCount, block = True)
+
+            self._sessions[(hostname, useCloudscraper)] = session
+
+            return session
+
+    def Close(self) -> None:
+
+        ##
+        #
+        # Closes all the sessions (and their connections). Sessions requested afterwards are created
+        # anew.
+        #
+        ##
+
+        with self._lock:
+
+            for session in self._sessions.values():
+                session.close()
+
+            self._sessions.clear()
+
+#
+#
+#
+# Globals.
+#
+#
+#
+
+# The pool used by all the web sessions of the application.
+
+SharedSessionPool = SessionPool(Configuration.MaximumConnectionsPerHost)
\ No newline at end of file
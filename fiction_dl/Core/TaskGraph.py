@@ -0,0 +1,140 @@
+####
+#
+# fiction-dl
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Standard packages.
+
+from concurrent.futures import Executor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+#
+#
+#
+# Classes.
+#
+#
+#
+
+##
+#
+# A set of tasks depending on one another. Every task is started as soon as all the tasks it
+# depends on have finished, so independent tasks run concurrently.
+#
+##
+
+class TaskGraph:
+
+    def __init__(self) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        ##
+
+        self._tasks: Dict[str, Tuple[Callable[[], Any], List[str]]] = {}
+
+    def AddTask(self, name: str, function: Callable[[], Any], dependencies: Optional[List[str]] = None) -> None:
+
+        ##
+        #
+        # Adds a task. The tasks it depends on have to be added beforehand (so there can be no
+        # cycles).
+        #
+        # @param name         The name of the task.
+        # @param function     The function performing the task. Takes no arguments.
+        # @param dependencies The names of the tasks that have to finish before this one starts.
+        #
+        ##
+
+        dependencies = dependencies or []
+
+        if name in self._tasks:
+            raise ValueError(f'Task "{name}" has been added already.')
+
+        for dependency in dependencies:
+            if dependency not in self._tasks:
+                raise ValueError(f'Task "{name}" depends on an unknown task: "{dependency}".')
+
+        self._tasks[name] = (function, dependencies)
+
+    def Run(self, executor: Executor) -> Iterator[Tuple[str, Any]]:
+
+        ##
+        #
+        # Runs the tasks. If a task raises an exception, the tasks depending on it are skipped, and
+        # the exception is re-raised once all the other tasks have finished.
+        #
+        # @param executor The executor running the tasks.
+        #
+        # @return The names of the tasks, along with their results, in the order they finish in.
+        #
+        ##
+
+        pendingTasks = {name: set(dependencies) for name, (_, dependencies) in self._tasks.items()}
+        runningTasks = {}
+
+        caughtException = None
+
+        while True:
+
+            # Start the tasks whose dependencies have finished.
+
+            for name in [name for name, dependencies in pendingTasks.items() if not dependencies]:
+
+                del pendingTasks[name]
+
+                function, _ = self._tasks[name]
+                runningTasks[executor.submit(function)] = name
+
+            if not runningTasks:
+                break
+
+            # Wait for any task to finish.
+
+            finishedTasks, _ = wait(runningTasks, return_when = FIRST_COMPLETED)
+
+            for future in finishedTasks:
+
+                name = runningTasks.pop(future)
+
+                try:
+
+                    result = future.result()
+
+                except Exception as exception:
+
+                    caughtException = caughtException or exception
+                    continue
+
+                for dependencies in pendingTasks.values():
+                    dependencies.discard(name)
+
+                yield name, result
+
+        if caughtException:
+            raise caughtException
\ No newline at end of file
@@ -191,6 +191,19 @@ class ExtractorAO3(Extractor):
 
         return False
 
+    def SupportsConcurrentExtraction(self) -> bool:
+
+        ##
+        #
+        # Checks whether chapters can be extracted concurrently, i.e. whether ExtractChapter() can be
+        # called from multiple threads at once.
+        #
+        # @return **True** if they can, **False** otherwise.
+        #
+        ##
+
+        return False
+
     def ScanChannel(self, URL: str) -> Optional[List[str]]:
 
         ##
@@ -339,7 +352,7 @@ class ExtractorAO3(Extractor):
 
         # Download page soup.
 
-        soup = self._webSession.GetSoup(URL)
+        soup = self._webSession.GetSoup(URL, conditional = True)
         if not soup:
             return None
 
@@ -369,7 +382,7 @@ class ExtractorAO3(Extractor):
 
         for pageURL in pageURLs:
 
-            soup = self._webSession.GetSoup(pageURL)
+            soup = self._webSession.GetSoup(pageURL, conditional = True)
             if not soup:
                 logging.error("Failed to download a page of the Works webpage.")
                 continue
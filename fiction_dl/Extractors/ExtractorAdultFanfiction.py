@@ -161,7 +161,7 @@ class ExtractorAdultFanfiction(Extractor):
         zoneName = urlparse(self.Story.Metadata.URL).hostname.split(".")[0]
 
         authorProfileURL = f"{userProfileBaseURL}&view=story&zone={zoneName}"
-        authorProfileSoup = self._webSession.GetSoup(authorProfileURL)
+        authorProfileSoup = self._webSession.GetSoup(authorProfileURL, conditional = True)
         if not soup:
             logging.error(f'Failed to download page: "{authorProfileURL}".')
             return False
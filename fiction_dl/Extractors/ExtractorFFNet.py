@@ -113,14 +113,20 @@ class ExtractorFFNet(Extractor):
 
         return self._flareSolverrAvailable
 
-    def _GetSoup(self, url: str, parserName: str = "html.parser") -> Optional[BeautifulSoup]:
+    def _GetSoup(
+        self,
+        url: str,
+        parserName: str = "html.parser",
+        conditional: bool = False
+    ) -> Optional[BeautifulSoup]:
 
         ##
         #
         # Gets BeautifulSoup for a URL, using FlareSolverr if configured.
         #
-        # @param url        The URL to fetch.
-        # @param parserName The parser to use for BeautifulSoup.
+        # @param url         The URL to fetch.
+        # @param parserName  The parser to use for BeautifulSoup.
+        # @param conditional Request the page conditionally (unless FlareSolverr is used)?
         #
         # @return BeautifulSoup object, or None on failure.
         #
@@ -133,7 +139,7 @@ class ExtractorFFNet(Extractor):
             else:
                 logging.warning(f"FlareSolverr failed for {url}, falling back to cloudscraper")
         
-        return self._webSession.GetSoup(url, parserName)
+        return self._webSession.GetSoup(url, parserName, conditional)
 
     def ScanStory(self) -> bool:
 
@@ -155,7 +161,7 @@ class ExtractorFFNet(Extractor):
 
         normalizedURL = self._GetNormalizedStoryURL(self.Story.Metadata.URL)
 
-        soup = self._GetSoup(normalizedURL, self._chapterParserName)
+        soup = self._GetSoup(normalizedURL, self._chapterParserName, conditional = True)
         if not soup:
             logging.error(f'Failed to download tag soup: "{normalizedURL}".')
             return False
@@ -206,6 +212,19 @@ class ExtractorFFNet(Extractor):
             "fictionpress.com"
         ]
 
+    def SupportsConcurrentExtraction(self) -> bool:
+
+        ##
+        #
+        # Checks whether chapters can be extracted concurrently, i.e. whether ExtractChapter() can be
+        # called from multiple threads at once.
+        #
+        # @return **True** if they can, **False** otherwise.
+        #
+        ##
+
+        return False
+
     def ScanChannel(self, URL: str) -> Optional[List[str]]:
 
         ##
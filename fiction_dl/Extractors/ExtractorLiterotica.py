@@ -191,7 +191,7 @@ class ExtractorLiterotica(Extractor):
             return False
 
         authorsPageURL = authorElement["href"]
-        authorsPageSoup = self._webSession.GetSoup(authorsPageURL)
+        authorsPageSoup = self._webSession.GetSoup(authorsPageURL, conditional = True)
         if not authorsPageSoup:
             logging.error(f'Failed to download page: "{authorsPageURL}".')
             return False
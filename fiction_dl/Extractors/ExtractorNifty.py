@@ -108,7 +108,7 @@ class ExtractorNifty(Extractor):
 
         # Is it a single chapter story?
 
-        pageCode = self._webSession.Get(URL, textEncoding = "ascii")
+        pageCode = self._webSession.Get(URL, textEncoding = "ascii", conditional = True)
         if not pageCode:
             logging.error("Failed to download story page when scanning.")
             return False
@@ -121,7 +121,7 @@ class ExtractorNifty(Extractor):
 
             # Create tag soup.
 
-            soup = self._webSession.GetSoup(URL)
+            soup = self._webSession.GetSoup(URL, conditional = True)
 
             # Create a list of chapters.
 
@@ -48,7 +48,6 @@ from bs4 import BeautifulSoup
 from dreamy_utilities.Filesystem import ReadTextFile
 from dreamy_utilities.Interface import Interface
 from dreamy_utilities.Text import GetDateFromTimestamp, GetLevenshteinDistance, GetLongestLeadingSubstring, PrettifyTitle
-from fake_useragent import UserAgent
 from markdown import markdown
 from praw import Reddit
 from praw.exceptions import InvalidURL
@@ -79,7 +78,7 @@ class ExtractorReddit(Extractor):
 
         self._downloadChapterSoupWhenExtracting = False
 
-        self._userAgent = UserAgent().random
+        self._userAgent = self._UserAgents.random
 
         if not ExtractorReddit._RefreshToken:
             self._redditInstance = Reddit(
@@ -111,6 +110,19 @@ class ExtractorReddit(Extractor):
             "reddit.com"
         ]
 
+    def SupportsConcurrentExtraction(self) -> bool:
+
+        ##
+        #
+        # Checks whether chapters can be extracted concurrently, i.e. whether ExtractChapter() can be
+        # called from multiple threads at once.
+        #
+        # @return **True** if they can, **False** otherwise.
+        #
+        ##
+
+        return False
+
     def SupportsAuthentication(self) -> bool:
 
         ##
@@ -186,7 +186,7 @@ class ExtractorSamAndJack(Extractor):
         # Read additional metadata and retrieve chapter URLs.
 
         tableOfContentsURL = f"{URL}&index=1"
-        soup = self._webSession.GetSoup(tableOfContentsURL)
+        soup = self._webSession.GetSoup(tableOfContentsURL, conditional = True)
         if not soup:
             logging.error(f"Failed to download page: \"{tableOfContentsURL}\".")
             return False
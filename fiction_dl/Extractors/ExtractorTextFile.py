@@ -78,6 +78,19 @@ class ExtractorTextFile(Extractor):
 
         return False
 
+    def SupportsConcurrentExtraction(self) -> bool:
+
+        ##
+        #
+        # Checks whether chapters can be extracted concurrently, i.e. whether ExtractChapter() can be
+        # called from multiple threads at once.
+        #
+        # @return **True** if they can, **False** otherwise.
+        #
+        ##
+
+        return False
+
     def Initialize(self, filePath: str) -> bool:
 
         ##
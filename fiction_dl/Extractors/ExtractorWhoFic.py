@@ -254,7 +254,7 @@ class ExtractorWhoFic(Extractor):
 
         # Download the author's page soup.
 
-        soup = self._webSession.GetSoup(authorPageURL)
+        soup = self._webSession.GetSoup(authorPageURL, conditional = True)
         if not soup:
             return [datePublished, dateUpdated, summary]
 
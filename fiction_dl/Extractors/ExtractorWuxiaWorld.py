@@ -112,7 +112,7 @@ class ExtractorWuxiaWorld(Extractor):
             return False
 
         normalizedURL = self._BASE_NOVEL_URL + storyIdentifier
-        soup = self._webSession.GetSoup(normalizedURL)
+        soup = self._webSession.GetSoup(normalizedURL, conditional = True)
         if not soup:
             logging.error(f"Failed to download page: \"{normalizedURL}\".")
             return False
@@ -30,16 +30,19 @@
 
 from fiction_dl.Concepts.Chapter import Chapter
 from fiction_dl.Concepts.Extractor import Extractor
+import fiction_dl.Configuration as Configuration
 
 # Standard packages.
 
+from collections import OrderedDict
 import logging
 import re
+from threading import Lock
 from typing import List, Optional
 
 # Non-standard packages.
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from dreamy_utilities.Filesystem import WriteTextFile
 from dreamy_utilities.Interface import Interface
 from dreamy_utilities.Text import GetDateFromTimestamp, Stringify
@@ -68,6 +71,11 @@ class ExtractorXenForo(Extractor):
         self._baseURL = GetSiteURL(forumURL)
         self._forumURL = forumURL
 
+        self._pageSoups = OrderedDict()
+        self._pageSoupsLock = Lock()
+
+        self._downloadStorySoupWhenScanning = False
+
     def SupportsAuthentication(self) -> bool:
 
         ##
@@ -172,36 +180,105 @@ class ExtractorXenForo(Extractor):
 
         return self.AuthenticationResult.SUCCESS
 
-    def ExtractChapter(self, index: int) -> Optional[Chapter]:
+    def GetChapterPageURL(self, index: int) -> Optional[str]:
 
         ##
         #
-        # Extracts specific chapter.
+        # Returns the URL of the page specific chapter is extracted from. Threadmarked posts often share
+        # thread pages (especially in quests), and every page is downloaded only once.
         #
-        # @param index The index of the chapter to be extracted.
+        # @param index The index of the chapter.
         #
-        # @return **True** if the chapter is extracted correctly, **False** otherwise.
+        # @return The URL of the page, or **None** if the chapter doesn't exist.
         #
         ##
 
-        if index > len(self._chapterURLs):
-            logging.error(
-                f"Trying to extract chapter {index}. "
-                f"Only {len(self._chapterURLs)} chapter(s) located. "
-                f"The story supposedly has {self.Story.Metadata.ChapterCount} chapter(s)."
-            )
+        if not (1 <= index <= len(self._chapterURLs)):
             return None
 
-        chapterURL = self._chapterURLs[index - 1]
+        return self._chapterURLs[index - 1].split("#")[0]
+
+    def _DownloadSoup(
+        self,
+        URL: str,
+        parserName: str = "html.parser",
+        parseOnly: Optional[SoupStrainer] = None
+    ) -> Optional[BeautifulSoup]:
 
-        soup = self._webSession.GetSoup(chapterURL)
+        ##
+        #
+        # Downloads a page and creates its tag soup. The soups of recently downloaded pages are kept
+        # and reused (see GetChapterPageURL()).
+        #
+        # @param URL        The URL of the page.
+        # @param parserName The parser to be used.
+        # @param parseOnly  The strainer restricting parsing to the elements matching it (and their
+        #                   contents). If **None**, the whole page is parsed.
+        #
+        # @return The tag soup, or **None** if the page couldn't be downloaded.
+        #
+        ##
+
+        pageURL = URL.split("#")[0]
+
+        with self._pageSoupsLock:
+
+            if (soup := self._pageSoups.get(pageURL)) is not None:
+                self._pageSoups.move_to_end(pageURL)
+                return soup
+
+        soup = super()._DownloadSoup(pageURL, parserName, parseOnly)
         if not soup:
-            logging.error(f'Failed to download page: "{chapterURL}".')
             return None
 
-        if -1 != (postIDLocation := chapterURL.find("#")):
+        # Only a few pages are processed at once (one per worker thread), and chapters located on
+        # the same page are extracted one after another, so only a few soups are kept.
+
+        with self._pageSoupsLock:
+
+            self._pageSoups[pageURL] = soup
+
+            while len(self._pageSoups) > max(1, Configuration.MaximumConcurrentChapterDownloads):
+                self._pageSoups.popitem(last = False)
+
+        return soup
+
+    def _GetChapterSoupStrainer(self, URL: str) -> Optional[SoupStrainer]:
+
+        ##
+        #
+        # Returns the strainer restricting parsing of a chapter page to the elements the extractor needs
+        # to extract the chapter: the posts (the rest of a thread page - navigation, sidebars, scripts -
+        # is skipped).
+        #
+        # @param URL The URL of the chapter.
+        #
+        # @return The strainer.
+        #
+        ##
 
-            postID = chapterURL[postIDLocation + 1:]
+        return SoupStrainer(["article", "li"], attrs = {"class": self._PostClassPattern})
+
+    def _InternallyExtractChapter(
+        self,
+        URL: str,
+        soup: Optional[BeautifulSoup]
+    ) -> Optional[Chapter]:
+
+        ##
+        #
+        # Extracts specific chapter.
+        #
+        # @param URL  The URL of the page containing the chapter.
+        # @param soup The tag soup of the page containing the chapter.
+        #
+        # @return **True** if the chapter is extracted correctly, **False** otherwise.
+        #
+        ##
+
+        if -1 != (postIDLocation := URL.find("#")):
+
+            postID = URL[postIDLocation + 1:]
 
             postElement = soup.find("article", {"data-content": postID}) or soup.select_one(f"#{postID}")
             if not postElement:
@@ -252,7 +329,7 @@ class ExtractorXenForo(Extractor):
             logging.error("Failed to generate raw story URL.")
             return False
 
-        soup = self._webSession.GetSoup(storyURL)
+        soup = self._webSession.GetSoup(storyURL, conditional = True)
         if not soup:
             logging.error(f'Failed to download page: "{storyURL}".')
             return False
@@ -271,7 +348,7 @@ class ExtractorXenForo(Extractor):
 
         # Retrieve story metadata.
 
-        soup = self._webSession.GetSoup(threadmarksURL)
+        soup = self._webSession.GetSoup(threadmarksURL, conditional = True)
 
         if not soup:
 
@@ -280,7 +357,7 @@ class ExtractorXenForo(Extractor):
                 logging.error("Failed to generate threadmarks URL.")
                 return False
 
-            soup = self._webSession.GetSoup(threadmarksURL)
+            soup = self._webSession.GetSoup(threadmarksURL, conditional = True)
             if not soup:
                 logging.error(f'Failed to download page: "{threadmarksURL}".')
                 return False
@@ -391,5 +468,10 @@ class ExtractorXenForo(Extractor):
             f"{self._forumURL}threads/{threadTitle}/threadmarks-load-range?category_id=1&min=-1&max=5000"
         )
 
+    # The class of post elements. The pattern is matched against the whole value of the attribute, as
+    # strainers see it before it's split into separate classes.
+
+    _PostClassPattern = re.compile(r"(?:^|\s)message(?:\s|$)")
+
     _userName = None
     _userPassword = None
\ No newline at end of file
@@ -71,7 +71,8 @@ class FormatterEPUB(Formatter):
         #
         # The constructor.
         #
-        # @param embedImages Embed images in the output file.
+        # @param embedImages    Embed images in the output file.
+        # @param coverImageData The cover image (encoded JPEG data). Optional.
         #
         ##
 
@@ -79,6 +80,9 @@ class FormatterEPUB(Formatter):
 
         self.CoverImageData = coverImageData
 
+        self._book = None
+        self._finalChapters = []
+
     def FormatAndSave(self, story: Union[Story, StoryPackage], filePath: Path) -> bool:
 
         ##
@@ -93,6 +97,22 @@ class FormatterEPUB(Formatter):
         #
         ##
 
+        return self.Format(story) and self.Save(filePath)
+
+    def Format(self, story: Union[Story, StoryPackage]) -> bool:
+
+        ##
+        #
+        # Formats the story (or the story package), without saving it. The cover image isn't
+        # needed at this point - it's only added by Save(), so it can be generated while the story
+        # is being formatted.
+        #
+        # @param story The story/story package to be formatted.
+        #
+        # @return **True** if the story was formatted without problems, **False** otherwise.
+        #
+        ##
+
         # Create the e-book.
 
         book = epub.EpubBook()
@@ -105,11 +125,6 @@ class FormatterEPUB(Formatter):
         book.add_metadata("DC", "description", metadata.Summary)
         book.add_author(metadata.Author)
 
-        # Set up the cover.
-
-        if self.CoverImageData:
-            book.set_cover(self._CoverImageName, self.CoverImageData)
-
         # Embed images.
 
         if self._embedImages:
@@ -160,6 +175,8 @@ class FormatterEPUB(Formatter):
 
         # Add chapters and create book spine.
 
+        self._finalChapters = []
+
         imageIndex = 0
         stories = story.Stories if isinstance(story, StoryPackage) else [story]
 
@@ -197,9 +214,6 @@ class FormatterEPUB(Formatter):
                 content = prefixer(index, chapter.Title, prettifiedStoryTitle) + chapter.Content
                 content = ReformatHTMLToXHTML(content)
 
-                if self.CoverImageData and (len(specificStory.Chapters) == index):
-                    content += f'<img src = "{self._CoverImageName}"/>'
-
                 # Replace images.
 
                 if self._embedImages:
@@ -230,6 +244,43 @@ class FormatterEPUB(Formatter):
                 book.add_item(bookChapter)
                 book.spine.append(bookChapter)
 
+            # The cover image is repeated at the end of each story.
+
+            if specificStory.Chapters:
+                self._finalChapters.append(bookChapter)
+
+        self._book = book
+
+        # Return.
+
+        return True
+
+    def Save(self, filePath: Path) -> bool:
+
+        ##
+        #
+        # Saves the formatted story to the output file. Format() has to be called beforehand.
+        #
+        # @param filePath The path to the output file.
+        #
+        # @return **True** if the output file was saved without problems, **False** otherwise.
+        #
+        ##
+
+        if self._book is None:
+            return False
+
+        book = self._book
+
+        # Set up the cover.
+
+        if self.CoverImageData:
+
+            book.set_cover(self._CoverImageName, self.CoverImageData)
+
+            for bookChapter in self._finalChapters:
+                bookChapter.content += f'<img src = "{self._CoverImageName}"/>'
+
         # Create a ToC.
 
         book.toc = book.spine[1:]
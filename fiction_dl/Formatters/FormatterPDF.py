@@ -30,11 +30,13 @@
 
 from fiction_dl.Concepts.Formatter import Formatter
 from fiction_dl.Concepts.Story import Story
+from fiction_dl.Core.LibreOfficeServer import LibreOfficeServer
 
 # Standard packages.
 
 from pathlib import Path
 from subprocess import call, DEVNULL
+from typing import Optional
 
 # Non-standard packages.
 
@@ -89,7 +91,8 @@ class FormatterPDF(Formatter):
         self,
         sourceFilePath: Path,
         outputDirectoryPath: Path,
-        converterFilePath: Path
+        converterFilePath: Path,
+        server: Optional[LibreOfficeServer] = None
     ) -> bool:
 
         ##
@@ -103,6 +106,9 @@ class FormatterPDF(Formatter):
         #                            source file. The directory **has** to exist beforehand, this
         #                            method does *not* create it.
         # @param converterFilePath   Path to the LibreOffice executable (soffice.exe/soffice).
+        # @param server              The LibreOffice server performing the conversion. Optional: if
+        #                            it's not specified (or it fails), LibreOffice is started to
+        #                            perform the conversion.
         #
         # @return **True** if the conversion has been performed successfully, **False** otherwise.
         #
@@ -117,6 +123,9 @@ class FormatterPDF(Formatter):
         elif not converterFilePath.is_file():
             return False
 
+        if server and server.ConvertToPDF(sourceFilePath, outputDirectoryPath / (sourceFilePath.stem + ".pdf")):
+            return True
+
         call(
             [
                 Stringify(converterFilePath),
@@ -0,0 +1,87 @@
+####
+#
+# fiction-dl
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Application.
+
+from fiction_dl.Concepts.Processor import Processor
+from fiction_dl.Processors.SanitizerProcessor import SanitizerProcessor
+from fiction_dl.Processors.TypographyProcessor import TypographyProcessor
+
+# Standard packages.
+
+from typing import Optional
+
+#
+#
+#
+# Classes.
+#
+#
+#
+
+##
+#
+# Processes chapter content: sanitizes it and fixes its typography. Combines all the other
+# processors into a single pipeline.
+#
+##
+
+class ContentProcessor(Processor):
+
+    def __init__(self) -> None:
+
+        ##
+        #
+        # The constructor.
+        #
+        ##
+
+        self._sanitizerProcessor = SanitizerProcessor()
+        self._typographyProcessor = TypographyProcessor()
+
+    def Process(self, content: str) -> Optional[str]:
+
+        ##
+        #
+        # Processes the content given and returns a modified version of it.
+        #
+        # @param content The content to be processed.
+        #
+        # @return The processed content.
+        #
+        ##
+
+        # The sanitizer is used twice - once before any other processing, once after every other
+        # processor. The first time is required to clean up the story (remove empty tags and tag
+        # trees, for example), the second to guarantee that the story is actually sanitized.
+
+        content = self._sanitizerProcessor.Process(content)
+        content = self._typographyProcessor.Process(content)
+        content = self._sanitizerProcessor.Process(content)
+
+        return content
\ No newline at end of file
@@ -29,7 +29,7 @@
 # Application.
 
 from fiction_dl.Concepts.Processor import Processor
-from fiction_dl.Utilities.HTML import CleanHTML, StripEmptyTags, StripTags
+from fiction_dl.Utilities.HTML import CleanHTML, CollapseWhitespaceStrings, StripEmptyTagsFromSoup, StripTags
 
 # Standard packages.
 
@@ -85,35 +85,18 @@ class SanitizerProcessor(Processor):
         content = CleanHTML(content)
         content = StripTags(content, self._Tags)
 
-        # Strip empty tags.
+        # Strip empty tags and attributes. Both operate on the same tag soup, so that the code is
+        # parsed only once.
 
-        content = StripEmptyTags(content, ["hr", "img"])
-
-        # Strip attributes.
+        if not content:
+            return None
 
         soup = BeautifulSoup(content, features = "html.parser")
 
-        for tag in soup.find_all(lambda x: len(x.attrs) > 0):
-
-            for name, value in list(tag.attrs.items()):
-
-                if ("a" == tag.name) and ("href" == name):
-
-                    # Fix parentheses - Typography Processor messes the up.
+        if StripEmptyTagsFromSoup(soup, ["hr", "img"]):
+            CollapseWhitespaceStrings(soup)
 
-                    if value.startswith("“"):
-                        value = value[1:]
-
-                    if value.endswith("”"):
-                        value = value[:-1]
-
-                    tag[name] = value
-
-                    continue
-
-                else:
-
-                    del tag[name]
+        self._StripAttributes(soup)
 
         content = str(soup)
 
@@ -158,4 +141,25 @@ class SanitizerProcessor(Processor):
 
         return content
 
+    @staticmethod
+    def _StripAttributes(soup: BeautifulSoup) -> None:
+
+        ##
+        #
+        # Strips all attributes from the tags in a tag soup, with the exception of "href" attributes
+        # of "a" tags.
+        #
+        # @param soup The tag soup.
+        #
+        ##
+
+        for tag in soup.find_all(lambda x: len(x.attrs) > 0):
+
+            for name in list(tag.attrs):
+
+                if ("a" == tag.name) and ("href" == name):
+                    continue
+
+                del tag[name]
+
     _Tags = ["p", "img", "hr", "b", "strong", "i", "em", "u", "a"]
\ No newline at end of file
@@ -29,11 +29,12 @@
 # Application.
 
 from fiction_dl.Concepts.Processor import Processor
+from fiction_dl.Utilities.HTML import CollapseWhitespaceStrings
 
 # Standard packages.
 
 import re
-from typing import Optional
+from typing import List, Optional, Pattern, Tuple
 
 # Non-standard packages.
 
@@ -97,7 +98,13 @@ class TypographyProcessor(Processor):
 
         ##
         #
-        # Replaces quotation marks with prettier ones.
+        # Replaces quotation marks with prettier ones. Only text is modified: tags (and their
+        # attributes) are left intact.
+        #
+        # Whether a quotation mark opens or closes a quotation is decided by the characters
+        # surrounding it or - if those are ambiguous - by the previous quotation mark. Paragraph
+        # boundaries count as whitespace, so quotations spanning multiple paragraphs (which open
+        # every paragraph, but close only the last one) are handled correctly.
         #
         # @param content Input content.
         #
@@ -108,113 +115,157 @@ class TypographyProcessor(Processor):
         if not content:
             return None
 
-        quotationMarkCount = 0;
-        processedContent = ""
+        if '"' not in content:
+            return content
+
+        # Split the content into text (even indices) and tags (odd indices), then replace quotation
+        # marks in text.
+
+        tokens = TypographyProcessor._TagPattern.split(content)
+
+        quotationOpen = False
+
+        for index in range(0, len(tokens), 2):
+
+            if '"' not in tokens[index]:
+                continue
+
+            pieces = tokens[index].split('"')
+            processedPieces = [pieces[0]]
+
+            precedingCharacter =                                          \
+                pieces[0][-1] if pieces[0] else                           \
+                TypographyProcessor._GetAdjacentCharacter(tokens, index, -1)
 
-        for letter in content:
+            for pieceIndex in range(1, len(pieces)):
 
-            if '"' != letter:
+                piece = pieces[pieceIndex]
 
-                processedContent += letter
+                followingCharacter =                                      \
+                    piece[0] if piece else                                \
+                    '"' if (pieceIndex + 1 < len(pieces)) else            \
+                    TypographyProcessor._GetAdjacentCharacter(tokens, index, 1)
 
-            else:
+                quotationOpen = TypographyProcessor._IsOpeningQuotationMark(
+                    precedingCharacter,
+                    followingCharacter,
+                    quotationOpen
+                )
 
-                quotationMarkCount += 1
+                quotationMark = "“" if quotationOpen else "”"
 
-                processedContent += "“" if (quotationMarkCount % 2) else "”"
+                processedPieces.append(quotationMark)
+                processedPieces.append(piece)
 
-        return processedContent
+                precedingCharacter = piece[-1] if piece else quotationMark
+
+            tokens[index] = "".join(processedPieces)
+
+        return "".join(tokens)
 
     @staticmethod
-    def _FixPrimitivePunctuation(content: str) -> Optional[str]:
+    def _GetAdjacentCharacter(tokens: List[str], index: int, direction: int) -> str:
 
         ##
         #
-        # Fixes "primitive" whitespace. That is, it replaces things like "..." with things like
-        # "…".
+        # Finds the character preceding or following a piece of text, skipping inline tags.
         #
-        # @param content Input content.
+        # @param tokens    Text (even indices) and tags (odd indices).
+        # @param index     The index of the piece of text.
+        # @param direction -1 to find the preceding character, 1 to find the following one.
         #
-        # @return Processed content, optionally **None**.
+        # @return The character, or an empty string if the text is at the boundary of a paragraph.
         #
         ##
 
-        if not content:
-            return None
+        index += direction
 
-        # Example: ".." -> "…"
-        content = re.sub("(\.){2,}", "…", content)
+        while 0 <= index < len(tokens):
 
-        # Example: ". . ." -> "…"
-        content = re.sub("(\.\\s){2,}", "…", content)
+            if index % 2:
 
-        # Example: "………" -> "…"
-        content = re.sub("…+", "…", content)
+                if TypographyProcessor._BlockTagPattern.match(tokens[index]):
+                    return ""
 
-        # Example: "…." -> "…"
-        content = re.sub("…\.+", "…", content)
+            elif tokens[index]:
 
-        # Example: "???" -> "?"
-        content = re.sub("\?+", "?", content)
+                return tokens[index][-1] if (direction < 0) else tokens[index][0]
 
-        # Example: " - " -> " — "
-        content = re.sub("(\\s)-(\\s)", r"\1—\2", content)
+            index += direction
 
-        # Example: "-----" -> "—"
-        content = re.sub("(\-){2,}", "—", content)
-
-        return content
+        return ""
 
     @staticmethod
-    def _FixPunctuationWhitespace(content: str) -> Optional[str]:
+    def _IsOpeningQuotationMark(precedingCharacter: str, followingCharacter: str, quotationOpen: bool) -> bool:
 
         ##
         #
-        # Fixes whitespace around punctuation.
+        # Decides whether a quotation mark opens a quotation.
         #
-        # @param content Input content.
+        # @param precedingCharacter The character preceding the quotation mark (empty at the start of
+        #                           a paragraph).
+        # @param followingCharacter The character following the quotation mark (empty at the end of a
+        #                           paragraph).
+        # @param quotationOpen      Has the previous quotation mark opened a quotation?
         #
-        # @return Processed content, optionally **None**.
+        # @return **True** if the quotation mark opens a quotation, **False** if it closes one.
         #
         ##
 
-        if not content:
-            return None
+        precededBySpace =                                                         \
+            (not precedingCharacter)                                              \
+            or precedingCharacter.isspace()                                       \
+            or (precedingCharacter in TypographyProcessor._CharactersBeforeOpeningQuotationMarks)
 
-        # Example: "  " -> " "
-        content = re.sub("(\\s){2,}", " ", content)
+        followedBySpace =                                                         \
+            (not followingCharacter)                                              \
+            or followingCharacter.isspace()                                       \
+            or (followingCharacter in TypographyProcessor._CharactersAfterClosingQuotationMarks)
 
-        # Example: "A , B" -> "A, B"
-        content = re.sub("(\\s),(\\s)", r",\2", content)
+        if precededBySpace and not followedBySpace:
+            return True
 
-        # Example: "A ,B" -> "A, B"
-        content = re.sub("(\\s),(\\S)", r", \2", content)
+        elif followedBySpace and not precededBySpace:
+            return False
 
-        # Example: "A…B" -> "A… B"
-        content = re.sub("(\\S)…(\\S)", r"\1… \2", content)
+        return not quotationOpen
 
-        # Example: "A … B" -> "A… B"
-        content = re.sub("(\\s)…(\\s)", r"…\2", content)
+    @staticmethod
+    def _FixPrimitivePunctuation(content: str) -> Optional[str]:
 
-        # Example: " ?" -> "?"
-        content = re.sub("(\\s)\\?", "?", content)
+        ##
+        #
+        # Fixes "primitive" whitespace. That is, it replaces things like "..." with things like
+        # "…".
+        #
+        # @param content Input content.
+        #
+        # @return Processed content, optionally **None**.
+        #
+        ##
 
-        # Example: " !" -> "!"
-        content = re.sub("(\\s)\\!", "!", content)
+        if not content:
+            return None
 
-        # Example: "???" -> "?"
-        content = re.sub("\?+", "?", content)
+        return TypographyProcessor._ApplyRules(content, TypographyProcessor._PrimitivePunctuationRules)
 
-        # Example: "A- " -> "A— "
-        content = re.sub("(\\S)-(\\s)", r"\1—\2", content)
+    @staticmethod
+    def _FixPunctuationWhitespace(content: str) -> Optional[str]:
 
-        # Example: " -A" -> " — A"
-        content = re.sub("(\\s)-(\\S)", r" — \2", content)
+        ##
+        #
+        # Fixes whitespace around punctuation.
+        #
+        # @param content Input content.
+        #
+        # @return Processed content, optionally **None**.
+        #
+        ##
 
-        # Example: "A—B" -> "A — B"
-        content = re.sub("(\\S)—(\\S)", r"\1 — \2", content)
+        if not content:
+            return None
 
-        return content
+        return TypographyProcessor._ApplyRules(content, TypographyProcessor._PunctuationWhitespaceRules)
 
     @staticmethod
     def _FixParagraphWhitespace(content: str) -> Optional[str]:
@@ -232,9 +283,7 @@ class TypographyProcessor(Processor):
         if not content:
             return None
 
-        content = re.sub(r"<p>\s*(.*)\s*</p>", r"<p>\1</p>", content)
-
-        return content
+        return TypographyProcessor._ApplyRules(content, TypographyProcessor._ParagraphWhitespaceRules)
 
     @staticmethod
     def _ReplacePseudolinesWithLines(content: str) -> Optional[str]:
@@ -258,10 +307,7 @@ class TypographyProcessor(Processor):
         soup = BeautifulSoup(content, features = "html.parser")
 
         MAXIMUM_PSEUDOLINE_LENGTH = 30
-        for tag in soup.find_all(recursive = True):
-
-            if "p" != tag.name:
-                continue
+        for tag in soup.find_all("p"):
 
             tagText = tag.get_text()
 
@@ -273,58 +319,155 @@ class TypographyProcessor(Processor):
 
         content = str(soup)
 
-        # Replace inline pseudolines.
+        # Replace inline pseudolines. The code has to be parsed again only if any have been found.
 
-        Pseudolines = [
+        processedContent = TypographyProcessor._ApplyRules(content, TypographyProcessor._PseudolineRules)
 
-            "(o\-){3,}",
-            "(o \-){3,}",
+        if processedContent != content:
+            soup = BeautifulSoup(processedContent, features = "html.parser")
+        else:
+            CollapseWhitespaceStrings(soup)
 
-            "(\*){3,}",
-            "(\* ){2,}",
+        # Remove multiple lines in sequence.
 
-            "(\-){3,}",
-            "(\- ){3,}",
+        for tag in soup.find_all("hr"):
 
-            "(\-[a-zA-Z]){3,}",
-            "(\- [a-zA-Z]){3,}",
+            if not tag.next_sibling:
+                continue
 
-            "(\—){3,}",
-            "(\— ){3,}",
+            elif "hr" != tag.next_sibling.name:
+                continue
 
-            "(\—[a-zA-Z]){3,}",
-            "(\— [a-zA-Z]){3,}",
+            tag.decompose()
 
-            "(\+){3,}",
-            "(\+ ){2,}",
+        content = str(soup)
 
-            "(\_){3,}",
-            "(\_ ){2,}",
+        # Return.
 
-        ]
+        return content
 
-        for pseudoline in Pseudolines:
-            content = re.sub(pseudoline, "<hr/>", content)
+    @staticmethod
+    def _ApplyRules(content: str, rules: List[Tuple[Pattern, str]]) -> str:
 
-        # Remove multiple lines in sequence.
+        ##
+        #
+        # Applies a list of rules to the content, in order.
+        #
+        # @param content Input content.
+        # @param rules   The rules: pairs of compiled patterns and replacements.
+        #
+        # @return Processed content.
+        #
+        ##
 
-        soup = BeautifulSoup(content, features = "html.parser")
+        for pattern, replacement in rules:
+            content = pattern.sub(replacement, content)
 
-        for tag in soup.find_all(recursive = True):
+        return content
 
-            if "hr" != tag.name:
-                continue
+    # Splits code into text and tags.
+    _TagPattern = re.compile(r"(<[^>]*>)")
 
-            elif not tag.next_sibling:
-                continue
+    # Matches tags that start or end a paragraph (or a similar block of text).
+    _BlockTagPattern = re.compile(r"</?(p|div|blockquote|h[1-6]|li|td|hr|br)\b", re.IGNORECASE)
 
-            elif "hr" != tag.next_sibling.name:
-                continue
+    # Characters that can precede an opening quotation mark, and follow a closing one.
+    _CharactersBeforeOpeningQuotationMarks = "([{“‘—–-"
+    _CharactersAfterClosingQuotationMarks = ".,;:!?)]}…—–"
 
-            tag.decompose()
+    # The typography rules: pairs of patterns and replacements, applied in order. The patterns are
+    # compiled once. Rules that can't affect one another share a single pattern, so that the content
+    # is scanned as few times as possible.
 
-        content = str(soup)
+    _PrimitivePunctuationRules = [(re.compile(pattern), replacement) for pattern, replacement in [
 
-        # Return.
+        # Examples: ".." -> "…", ". . ." -> "…"
+        (r"\.(?:\.+|\s(?:\.\s)+)", "…"),
+
+        # Examples: "………" -> "…", "…." -> "…"
+        (r"…+\.*", "…"),
+
+        # Example: "???" -> "?"
+        (r"\?{2,}", "?"),
+
+        # Example: " - " -> " — "
+        (r"(\s)-(\s)", r"\1—\2"),
+
+        # Example: "-----" -> "—"
+        (r"-{2,}", "—"),
+
+    ]]
+
+    _PunctuationWhitespaceRules = [(re.compile(pattern), replacement) for pattern, replacement in [
+
+        # Example: "  " -> " "
+        (r"\s{2,}", " "),
+
+        # Example: "A , B" -> "A, B"
+        (r"\s,(\s)", r",\1"),
+
+        # Example: "A ,B" -> "A, B"
+        (r"\s,(\S)", r", \1"),
+
+        # Example: "A…B" -> "A… B"
+        (r"(\S)…(\S)", r"\1… \2"),
+
+        # Example: "A … B" -> "A… B"
+        (r"\s…(\s)", r"…\1"),
+
+        # Examples: " ?" -> "?", " !" -> "!"
+        (r"\s([?!])", r"\1"),
+
+        # Example: "???" -> "?"
+        (r"\?{2,}", "?"),
+
+        # Example: "A- " -> "A— "
+        (r"(\S)-(\s)", r"\1—\2"),
+
+        # Example: " -A" -> " — A"
+        (r"\s-(\S)", r" — \1"),
+
+        # Example: "A—B" -> "A — B"
+        (r"(\S)—(\S)", r"\1 — \2"),
+
+    ]]
+
+    _ParagraphWhitespaceRules = [(re.compile(pattern), replacement) for pattern, replacement in [
+
+        (r"<p>\s*(.*)\s*</p>", r"<p>\1</p>"),
+
+    ]]
+
+    _PseudolineRules = [(re.compile(pattern), replacement) for pattern, replacement in [
+
+        # Examples: "o-o-o-", "***", "* * ", "---", "- - - ", "-a-b-c", "———", "+++", "___". The
+        # lookahead lets the scan skip most characters without trying every alternative.
+        ("(?=[o*+_—-])(?:" + "|".join([
+
+            r"(?:o-){3,}",
+            r"(?:o -){3,}",
+
+            r"\*{3,}",
+            r"(?:\* ){2,}",
+
+            r"-{3,}",
+            r"(?:- ){3,}",
+
+            r"(?:-[a-zA-Z]){3,}",
+            r"(?:- [a-zA-Z]){3,}",
+
+            r"—{3,}",
+            r"(?:— ){3,}",
+
+            r"(?:—[a-zA-Z]){3,}",
+            r"(?:— [a-zA-Z]){3,}",
+
+            r"\+{3,}",
+            r"(?:\+ ){2,}",
+
+            r"_{3,}",
+            r"(?:_ ){2,}",
+
+        ]) + ")", "<hr/>"),
 
-        return content
\ No newline at end of file
+    ]]
\ No newline at end of file
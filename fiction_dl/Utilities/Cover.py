@@ -0,0 +1,386 @@
+####
+#
+# fiction-dl
+# Copyright (C) (2020 - 2021) Benedykt Synakiewicz <dreamcobbler@outlook.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+####
+
+#
+#
+#
+# Imports.
+#
+#
+#
+
+# Application.
+
+from fiction_dl.Concepts.Story import Story
+from fiction_dl.Concepts.StoryPackage import StoryPackage
+from fiction_dl.Utilities.Filesystem import GetPackageDirectory
+
+# Standard packages.
+
+from functools import lru_cache
+from io import BytesIO
+from typing import List, Optional, Union
+
+# Non-standard packages.
+
+from dreamy_utilities.Filesystem import ReadTextFile
+import PIL.Image
+import PIL.ImageDraw
+import PIL.ImageFont
+
+#
+#
+#
+# Globals.
+#
+#
+#
+
+# Preferred fonts (searched for in system font directories), in the order of preference. The first one covering all the
+# characters of the text is used: the ones at the end cover Cyrillic, Greek and CJK scripts.
+_RegularFontFileNames = [
+    "DejaVuSerif.ttf", "LiberationSerif-Regular.ttf", "times.ttf", "DejaVuSans.ttf", "arial.ttf",
+    "NotoSerifCJK-Regular.ttc", "NotoSansCJK-Regular.ttc", "msyh.ttc", "msgothic.ttc", "malgun.ttf",
+    "wqy-zenhei.ttc", "DroidSansFallbackFull.ttf", "arialuni.ttf",
+]
+_BoldFontFileNames = [
+    "DejaVuSerif-Bold.ttf", "LiberationSerif-Bold.ttf", "timesbd.ttf", "DejaVuSans-Bold.ttf", "arialbd.ttf",
+    "NotoSerifCJK-Bold.ttc", "NotoSansCJK-Bold.ttc", "msyhbd.ttc", "malgunbd.ttf",
+    *_RegularFontFileNames,
+]
+
+# A character no font contains (a noncharacter), used to recognize the glyph fonts draw for missing characters.
+_MissingCharacter = "\uffff"
+
+# The font size used to check which characters fonts contain, in pixels.
+_CoverageTestFontSize = 32
+
+# Font sizes and the size of margins, relative to the size of the image (the height and the width, respectively).
+_HeaderFontSize = 0.025
+_TitleFontSize = 0.06
+_BodyFontSize = 0.022
+_MarginSize = 0.1
+
+# The maximum height of the title, relative to the height of the image.
+_MaximumTitleHeight = 0.35
+
+# The minimum font size (in pixels), and the factor fonts are scaled down by when the text doesn't fit.
+_MinimumFontSize = 8
+_FontScale = 0.9
+
+# The height of a line of text, relative to the height of the font.
+_LineSpacing = 1.3
+
+#
+#
+#
+# Functions.
+#
+#
+#
+
+def GetCoverText(story: Union[Story, StoryPackage]) -> str:
+
+    ##
+    #
+    # Generates the text of a story's cover (its title page).
+    #
+    # @param story The story (or the story package).
+    #
+    # @return The text: the header in the first line, the title in the second one, and paragraphs in
+    #         the following ones.
+    #
+    ##
+
+    templateFileName =                          \
+        "Cover (Package).txt"                   \
+        if isinstance(story, StoryPackage) else \
+        "Cover.txt"
+
+    template = ReadTextFile(GetPackageDirectory() / f"Templates/FormatterEPUB/{templateFileName}")
+
+    return story.FillTemplate(template)
+
+def RenderCoverToBytes(text: str, width: int, height: int, quality: int = 90) -> Optional[bytes]:
+
+    ##
+    #
+    # Renders a cover image. The header is printed at the top, with the title below it, in large
+    # letters; the paragraphs are printed below the title. Fonts are scaled down if the text doesn't
+    # fit.
+    #
+    # @param text    The text of the cover, as generated by GetCoverText().
+    # @param width   The width of the image.
+    # @param height  The height of the image.
+    # @param quality The quality of the image (1 - 100).
+    #
+    # @return Encoded image data, in JPEG format; **None** if something fails.
+    #
+    ##
+
+    lines = [x.strip() for x in text.splitlines()]
+    if (len(lines) < 2) or (width <= 0) or (height <= 0):
+        return None
+
+    header = lines[0]
+    title = lines[1]
+    paragraphs = [x for x in lines[2:] if x]
+
+    headerFontFileName = _FindFontFileName(header)
+    titleFontFileName = _FindFontFileName(title, bold = True)
+    bodyFontFileName = _FindFontFileName("".join(paragraphs))
+
+    image = PIL.Image.new("RGB", (width, height), "white")
+    draw = PIL.ImageDraw.Draw(image)
+
+    margin = int(_MarginSize * width)
+    textWidth = width - 2 * margin
+
+    # Print the header.
+
+    font = _GetFont(headerFontFileName, int(_HeaderFontSize * height))
+    y = _DrawLines(draw, _WrapText(header, font, textWidth), font, margin, margin, textWidth, centered = True)
+
+    # Print the title.
+
+    y += int(_HeaderFontSize * height)
+
+    fontSize = int(_TitleFontSize * height)
+    while True:
+
+        font = _GetFont(titleFontFileName, fontSize)
+        titleLines = _WrapText(title, font, textWidth)
+
+        if (len(titleLines) * _GetLineHeight(font) <= _MaximumTitleHeight * height) or (fontSize <= _MinimumFontSize):
+            break
+
+        fontSize = int(_FontScale * fontSize)
+
+    y = _DrawLines(draw, titleLines, font, margin, y, textWidth, centered = True)
+
+    # Print a horizontal line.
+
+    y += int(_HeaderFontSize * height)
+
+    draw.line([(margin, y), (width - margin, y)], fill = "black", width = max(1, height // 400))
+
+    y += int(_HeaderFontSize * height)
+
+    # Print the paragraphs.
+
+    fontSize = int(_BodyFontSize * height)
+    while True:
+
+        font = _GetFont(bodyFontFileName, fontSize)
+        paragraphLines = [_WrapText(x, font, textWidth) for x in paragraphs]
+
+        lineHeight = _GetLineHeight(font)
+        totalHeight = sum(len(x) * lineHeight for x in paragraphLines) + len(paragraphLines) * lineHeight // 2
+
+        if (y + totalHeight <= height - margin) or (fontSize <= _MinimumFontSize):
+            break
+
+        fontSize = int(_FontScale * fontSize)
+
+    for paragraph in paragraphLines:
+
+        paragraph = paragraph[:max(0, (height - margin - y) // lineHeight)]
+        y = _DrawLines(draw, paragraph, font, margin, y, textWidth) + lineHeight // 2
+
+    # Encode the image.
+
+    imageData = BytesIO()
+    image.save(imageData, format = "JPEG", quality = quality, optimize = True)
+
+    return imageData.getvalue() or None
+
+@lru_cache(maxsize = None)
+def _FindFontFileName(text: str, bold: bool = False) -> Optional[str]:
+
+    ##
+    #
+    # Finds the font to be used to print given text: the first one of the preferred ones that's
+    # available and contains all the characters of the text or, if none does, the first one available.
+    #
+    # @param text The text.
+    # @param bold Look for a bold font?
+    #
+    # @return The name of the font file, or **None** if none of the preferred fonts is available.
+    #
+    ##
+
+    characters = {x for x in text if not x.isspace()}
+    firstAvailableFileName = None
+
+    for fileName in (_BoldFontFileNames if bold else _RegularFontFileNames):
+
+        try:
+            font = PIL.ImageFont.truetype(fileName, _CoverageTestFontSize)
+        except OSError:
+            continue
+
+        missingGlyph = _GetGlyph(font, _MissingCharacter)
+
+        if all(_GetGlyph(font, x) != missingGlyph for x in characters):
+            return fileName
+
+        firstAvailableFileName = firstAvailableFileName or fileName
+
+    return firstAvailableFileName
+
+def _GetGlyph(font: PIL.ImageFont.FreeTypeFont, character: str) -> tuple:
+
+    ##
+    #
+    # Renders a character.
+    #
+    # @param font      The font.
+    # @param character The character.
+    #
+    # @return The size and the pixels of the rendered glyph.
+    #
+    ##
+
+    mask = font.getmask(character)
+
+    return (mask.size, bytes(mask))
+
+def _GetFont(fileName: Optional[str], size: int) -> PIL.ImageFont.ImageFont:
+
+    ##
+    #
+    # Loads a font (see _FindFontFileName()), or the default one.
+    #
+    # @param fileName The name of the font file. The default font is loaded if it's **None**.
+    # @param size     The size of the font, in pixels.
+    #
+    # @return The font.
+    #
+    ##
+
+    size = max(1, size)
+
+    if fileName:
+        return PIL.ImageFont.truetype(fileName, size)
+
+    try:
+
+        return PIL.ImageFont.load_default(size)
+
+    except TypeError:
+
+        # Older versions of Pillow provide only a small bitmap font.
+
+        return PIL.ImageFont.load_default()
+
+def _GetLineHeight(font: PIL.ImageFont.ImageFont) -> int:
+
+    ##
+    #
+    # Calculates the height of a line of text.
+    #
+    # @param font The font.
+    #
+    # @return The height, in pixels.
+    #
+    ##
+
+    return max(1, int(_LineSpacing * font.getbbox("Ag")[3]))
+
+def _WrapText(text: str, font: PIL.ImageFont.ImageFont, width: int) -> List[str]:
+
+    ##
+    #
+    # Breaks text into lines that fit given width. Words too long to fit (URLs, for example) are broken
+    # as well.
+    #
+    # @param text  The text.
+    # @param font  The font.
+    # @param width The maximum width of a line, in pixels.
+    #
+    # @return The lines.
+    #
+    ##
+
+    lines = []
+    currentLine = ""
+
+    for word in text.split():
+
+        candidate = f"{currentLine} {word}" if currentLine else word
+
+        if font.getlength(candidate) <= width:
+            currentLine = candidate
+            continue
+
+        if currentLine:
+            lines.append(currentLine)
+
+        currentLine = ""
+
+        for character in word:
+
+            if currentLine and (font.getlength(currentLine + character) > width):
+                lines.append(currentLine)
+                currentLine = ""
+
+            currentLine += character
+
+    if currentLine:
+        lines.append(currentLine)
+
+    return lines
+
+def _DrawLines(
+    draw: PIL.ImageDraw.ImageDraw,
+    lines: List[str],
+    font: PIL.ImageFont.ImageFont,
+    x: int,
+    y: int,
+    width: int,
+    centered: bool = False
+) -> int:
+
+    ##
+    #
+    # Draws lines of text.
+    #
+    # @param draw     The drawing context.
+    # @param lines    The lines.
+    # @param font     The font.
+    # @param x        The left edge of the text.
+    # @param y        The top edge of the text.
+    # @param width    The width of the text (used to center lines).
+    # @param centered Center the lines?
+    #
+    # @return The bottom edge of the text.
+    #
+    ##
+
+    lineHeight = _GetLineHeight(font)
+
+    for line in lines:
+
+        lineX = (x + (width - font.getlength(line)) / 2) if centered else x
+        draw.text((lineX, y), line, font = font, fill = "black")
+
+        y += lineHeight
+
+    return y
\ No newline at end of file
@@ -53,7 +53,12 @@ from fiction_dl.Extractors.ExtractorWuxiaWorld import ExtractorWuxiaWorld
 
 # Standard packages.
 
-from typing import Optional
+from threading import Lock
+from typing import Dict, Optional, Type
+
+# Non-standard packages.
+
+from dreamy_utilities.Web import GetHostname
 
 #
 #
@@ -67,7 +72,8 @@ def CreateExtractor(URL: str) -> Optional[Extractor]:
 
     ##
     #
-    # Creates the appropriate extractor for any given URL.
+    # Creates the appropriate extractor for any given URL. Only the extractor handling the hostname
+    # of the URL is constructed; if there's none, the URL is treated as a path to a text file.
     #
     # @param URL The URL.
     #
@@ -75,36 +81,84 @@ def CreateExtractor(URL: str) -> Optional[Extractor]:
     #
     ##
 
-    availableExtractors = [
-
-        ExtractorAdultFanfiction(),
-        ExtractorAH(),
-        ExtractorAO3(),
-        ExtractorAsstrKristen(),
-        ExtractorFFNet(),
-        ExtractorFicWad(),
-        ExtractorHentaiFoundry(),
-        ExtractorHPFF(),
-        ExtractorLiterotica(),
-        ExtractorNajlepszaErotyka(),
-        ExtractorNifty(),
-        ExtractorQuestionableQuesting(),
-        ExtractorQuotev(),
-        ExtractorRalst(),
-        ExtractorReddit(),
-        ExtractorSamAndJack(),
-        ExtractorSpaceBattles(),
-        ExtractorSufficientVelocity(),
-        ExtractorWhoFic(),
-        ExtractorWuxiaWorld(),
-
-        ExtractorTextFile(),
-
-    ]
-
-    for extractor in availableExtractors:
+    if (extractorClass := GetExtractorClasses().get(GetHostname(URL))) is not None:
+
+        extractor = extractorClass()
 
         if extractor.Initialize(URL):
             return extractor
 
-    return None
\ No newline at end of file
+    extractor = ExtractorTextFile()
+
+    if extractor.Initialize(URL):
+        return extractor
+
+    return None
+
+def GetExtractorClasses() -> Dict[str, Type[Extractor]]:
+
+    ##
+    #
+    # Returns the registry of available extractors. It's built on first use, by querying each
+    # extractor for the hostnames it supports.
+    #
+    # @return A dictionary mapping hostnames to extractor classes.
+    #
+    ##
+
+    global _ExtractorClassesByHostname
+
+    with _ExtractorClassesByHostnameLock:
+
+        if _ExtractorClassesByHostname is None:
+
+            extractorClassesByHostname = {}
+
+            for extractorClass in _AvailableExtractorClasses:
+                for hostname in extractorClass().GetSupportedHostnames():
+                    extractorClassesByHostname.setdefault(hostname, extractorClass)
+
+            _ExtractorClassesByHostname = extractorClassesByHostname
+
+        return _ExtractorClassesByHostname
+
+#
+#
+#
+# Globals.
+#
+#
+#
+
+# Extractors handling specific sites (the text file extractor, which handles everything else, isn't
+# listed here).
+_AvailableExtractorClasses = [
+
+    ExtractorAdultFanfiction,
+    ExtractorAH,
+    ExtractorAO3,
+    ExtractorAsstrKristen,
+    ExtractorFFNet,
+    ExtractorFicWad,
+    ExtractorHentaiFoundry,
+    ExtractorHPFF,
+    ExtractorLiterotica,
+    ExtractorNajlepszaErotyka,
+    ExtractorNifty,
+    ExtractorQuestionableQuesting,
+    ExtractorQuotev,
+    ExtractorRalst,
+    ExtractorReddit,
+    ExtractorSamAndJack,
+    ExtractorSpaceBattles,
+    ExtractorSufficientVelocity,
+    ExtractorWhoFic,
+    ExtractorWuxiaWorld,
+
+]
+
+# The registry of extractors, built by GetExtractorClasses().
+_ExtractorClassesByHostname: Optional[Dict[str, Type[Extractor]]] = None
+
+# The lock guarding the registry.
+_ExtractorClassesByHostnameLock = Lock()
\ No newline at end of file
@@ -29,10 +29,14 @@
 # Application.
 
 from fiction_dl.Concepts.Image import Image
+import fiction_dl.Configuration as Configuration
 
 # Standard packages.
 
-from typing import Dict, List, Optional
+from html import escape
+from html.entities import html5
+import re
+from typing import Dict, List, Optional, Union
 from urllib.parse import urlparse
 
 # Non-standard packages.
@@ -40,6 +44,71 @@ from urllib.parse import urlparse
 import bleach
 from bs4 import BeautifulSoup
 from dreamy_utilities.HTML import UnescapeHTMLEntities
+import lxml.html
+from lxml.etree import iterwalk
+
+# The lxml-based implementations reproduce the output of BeautifulSoup and bleach, and rely on some
+# of their internals to do so. If these are missing (they've changed in a newer version), the
+# implementations based on BeautifulSoup and bleach are used instead.
+
+try:
+
+    from bleach.html5lib_shim import HTML_TAGS_BLOCK_LEVEL
+    from bleach.sanitizer import BleachSanitizerFilter
+    from bs4.builder import HTMLTreeBuilder
+
+    _MultiValuedAttributes = HTMLTreeBuilder.DEFAULT_CDATA_LIST_ATTRIBUTES
+    _LXMLImplementationsAvailable = callable(getattr(BleachSanitizerFilter, "allow_token", None))
+
+except (ImportError, AttributeError):
+
+    _LXMLImplementationsAvailable = False
+
+#
+#
+#
+# Globals.
+#
+#
+#
+
+# The tags lxml is known to parse just like html.parser and html5lib (used by bleach) do, as long as
+# they're nested properly. Container tags can contain any of them, paragraph tags and inline tags -
+# only inline tags. See IsMarkupSimple().
+
+_ContainerTags = {"blockquote", "center", "div"}
+_ParagraphTags = {"h1", "h2", "h3", "h4", "h5", "h6", "p"}
+_InlineTags = {"a", "b", "big", "em", "font", "i", "s", "small", "span", "strike", "strong", "sub", "sup", "u"}
+_VoidBlockTags = {"hr"}
+_VoidInlineTags = {"br", "img"}
+_VoidTags = _VoidBlockTags | _VoidInlineTags
+
+# Whitespace, as understood by HTML parsers.
+
+_Whitespace = " \t\n\f\r"
+
+# Patterns used to tokenize simple markup. Attribute values have to be quoted.
+
+_TagPattern = re.compile(
+    r"<(/?)([A-Za-z][A-Za-z0-9]*)"
+    r"((?:[ \t\n\r]+[A-Za-z][A-Za-z0-9_-]*[ \t\n\r]*=[ \t\n\r]*(?:\"[^\"]*\"|'[^']*'))*)"
+    r"[ \t\n\r]*(/?)>"
+)
+_AttributeNamePattern = re.compile(r"([A-Za-z][A-Za-z0-9_-]*)[ \t\n\r]*=[ \t\n\r]*(?:\"[^\"]*\"|'[^']*')")
+
+# Character references and characters the parsers handle in different ways. The references escaping
+# "&", "<" and ">" are handled the same way (with the exception of "&gt;" in attribute values), and
+# so are ampersands that can't start a reference (a few legacy references don't need a semicolon).
+# In text, a bare ampersand followed by a name is unsafe as well: html.parser drops it at the end of
+# the input, and bleach keeps it unescaped when stripping a tag turns it into a reference.
+
+_LegacyCharacterReferenceNames = sorted((x for x in html5 if not x.endswith(";")), key = len, reverse = True)
+
+_UnsafeCharacterPattern = re.compile(
+    "&(?:#|(?!(?:amp|lt|gt);)(?:[A-Za-z][A-Za-z0-9]*;|" + "|".join(_LegacyCharacterReferenceNames) + "))"
+    "|[\x00-\x08\x0b\x0c\x0e-\x1f\x7f\ud800-\udfff\ufffe\uffff]"
+)
+_UnsafeTextAmpersandPattern = re.compile("&(?!(?:amp|lt|gt);)[A-Za-z0-9#<]")
 
 #
 #
@@ -73,6 +142,25 @@ def CleanHTML(code: str) -> Optional[str]:
 
     return code
 
+def CollapseWhitespaceStrings(soup: BeautifulSoup) -> None:
+
+    ##
+    #
+    # Merges adjacent strings and collapses whitespace-only strings to a single space (or newline),
+    # just like the parser does. Modifying a tag soup can leave whitespace-only strings next to each
+    # other: this makes the soup look as if it has been serialized and parsed again.
+    #
+    # @param soup The tag soup.
+    #
+    ##
+
+    soup.smooth()
+
+    for string in soup.find_all(string = True):
+
+        if string and not string.strip(" \t\n\f\r"):
+            string.replace_with("\n" if ("\n" in string) else " ")
+
 def FindImagesInCode(code: str) -> List[Image]:
 
     ##
@@ -89,6 +177,86 @@ def FindImagesInCode(code: str) -> List[Image]:
 
     return [Image(UnescapeHTMLEntities(tag["src"])) for tag in soup.find_all("img")]
 
+def IsMarkupSimple(code: str) -> bool:
+
+    ##
+    #
+    # Checks whether given code is simple markup, i.e. markup lxml parses exactly the way html.parser
+    # and html5lib do. Simple markup consists of common text-formatting tags only, nested properly:
+    # every tag is closed, block tags aren't placed inside paragraphs or inline tags, links aren't
+    # placed inside other links. Attribute values are quoted. There are no comments and no control
+    # characters; the only character references are "&amp;", "&lt;" and "&gt;".
+    #
+    # @param code The input code.
+    #
+    # @return **True** if the code is simple markup, **False** otherwise.
+    #
+    ##
+
+    if _UnsafeCharacterPattern.search(code):
+        return False
+
+    openTags = []
+    position = 0
+
+    for match in _TagPattern.finditer(code):
+
+        if -1 != code.find("<", position, match.start()):
+            return False
+
+        if _UnsafeTextAmpersandPattern.search(code, position, match.start() + 1):
+            return False
+
+        position = match.end()
+
+        isEndTag, name, attributes, isSelfClosing = match.groups()
+        name = name.lower()
+
+        # Handle end tags.
+
+        if isEndTag:
+
+            if attributes or isSelfClosing or (not openTags) or (name != openTags[-1]):
+                return False
+
+            openTags.pop()
+            continue
+
+        # Handle start tags.
+
+        if (name in _InlineTags) or (name in _VoidInlineTags):
+
+            if ("a" == name) and ("a" in openTags):
+                return False
+
+        elif (name in _ContainerTags) or (name in _ParagraphTags) or (name in _VoidBlockTags):
+
+            if openTags and (openTags[-1] not in _ContainerTags):
+                return False
+
+        else:
+            return False
+
+        if "&gt;" in attributes:
+            return False
+
+        attributeNames = [x.lower() for x in _AttributeNamePattern.findall(attributes)]
+        if len(set(attributeNames)) != len(attributeNames):
+            return False
+
+        if name in _VoidTags:
+            continue
+
+        elif isSelfClosing:
+            return False
+
+        openTags.append(name)
+
+    if (-1 != code.find("<", position)) or _UnsafeTextAmpersandPattern.search(code, position):
+        return False
+
+    return not openTags
+
 def IsURLAbsolute(URL: str) -> bool:
 
     ##
@@ -144,6 +312,11 @@ def ReformatHTMLToXHTML(code: str) -> Optional[str]:
     if not code:
         return None
 
+    useLXML = _IsLXMLPreferred() and ("\r" not in code) and (not code.isspace())
+
+    if useLXML and IsMarkupSimple(code):
+        return _ReformatHTMLToXHTMLUsingLXML(code)
+
     soup = BeautifulSoup(code, "html.parser")
     code = str(soup)
 
@@ -174,41 +347,67 @@ def StripEmptyTags(
     if not code:
         return None
 
+    if _IsLXMLPreferred() and ("\r" not in code) and IsMarkupSimple(code):
+        return _StripEmptyTagsUsingLXML(code, validEmptyTags, validEmptyTagAttributes)
+
     soup = BeautifulSoup(code, features = "html.parser")
 
-    tagsStripped = 1
+    StripEmptyTagsFromSoup(soup, validEmptyTags, validEmptyTagAttributes)
 
-    while tagsStripped:
+    return str(soup)
 
-        tagsStripped = 0
+def StripEmptyTagsFromSoup(
+    soup: BeautifulSoup,
+    validEmptyTags: List[str] = [],
+    validEmptyTagAttributes: Dict = {}
+) -> int:
 
-        for tag in soup.find_all(True, recursive = True):
+    ##
+    #
+    # Strips all empty tags from a tag soup, in place. Lets the caller apply other modifications to
+    # the same soup, without parsing the code again.
+    #
+    # @param soup                    The tag soup.
+    # @param validEmptyTags          A list of tags allowed to be empty.
+    # @param validEmptyTagAttributes A dictionary of attributes with values that allow empty tag to
+    #                                get away with being empty.
+    #
+    # @return The number of stripped tags.
+    #
+    ##
 
-            if tag.name in validEmptyTags:
-                continue
+    # Tags are visited in reversed document order, so every tag is checked only after all of its
+    # descendants have been (and, if empty, stripped). A single pass is enough.
 
-            elif tag.find_all(True, recursive = True):
-                continue
+    tagsStripped = 0
 
-            elif len(tag.get_text(strip = True)):
-                continue
+    for tag in reversed(soup.find_all(True)):
 
-            elif validEmptyTagAttributes:
+        if tag.name in validEmptyTags:
+            continue
 
-                validBecauseOfAttributes = False
+        elif tag.find(True, recursive = False):
+            continue
 
-                for attribute, value in validEmptyTagAttributes.items():
+        elif len(tag.get_text(strip = True)):
+            continue
 
-                    if tag.has_attr(attribute) and (value == tag[attribute]):
-                        validBecauseOfAttributes = True
+        elif validEmptyTagAttributes:
 
-                if validBecauseOfAttributes:
-                    continue
+            validBecauseOfAttributes = False
 
-            tag.decompose()
-            tagsStripped += 1
+            for attribute, value in validEmptyTagAttributes.items():
 
-    return str(soup)
+                if tag.has_attr(attribute) and (value == tag[attribute]):
+                    validBecauseOfAttributes = True
+
+            if validBecauseOfAttributes:
+                continue
+
+        tag.decompose()
+        tagsStripped += 1
+
+    return tagsStripped
 
 def StripHTML(code: str, paragraphSeparator: str = "\n\n") -> Optional[str]:
 
@@ -226,8 +425,13 @@ def StripHTML(code: str, paragraphSeparator: str = "\n\n") -> Optional[str]:
     if not code:
         return None
 
+    code = CleanHTML(code)
+
+    if _IsLXMLPreferred() and IsMarkupSimple(code):
+        return _StripHTMLUsingLXML(code, paragraphSeparator)
+
     return BeautifulSoup(
-        StripTags(CleanHTML(code), ["p"]),
+        StripTags(code, ["p"]),
         "html.parser"
     ).get_text(separator = paragraphSeparator)
 
@@ -247,8 +451,339 @@ def StripTags(code: str, validTags: List[str] = []) -> Optional[str]:
     if not code:
         return None
 
+    if _IsLXMLPreferred() and IsMarkupSimple(code):
+        return _StripTagsUsingLXML(code, validTags)
+
     return bleach.clean(
         code,
         tags = validTags,
         strip = True
-    )
\ No newline at end of file
+    )
+
+def _CollapseWhitespaceText(element: lxml.html.HtmlElement) -> None:
+
+    ##
+    #
+    # Collapses whitespace-only text in an lxml tree to a single space (or newline), just like
+    # BeautifulSoup does when parsing code.
+    #
+    # @param element The root element of the tree.
+    #
+    ##
+
+    for descendant in element.iter():
+
+        if descendant.text and not descendant.text.strip(_Whitespace):
+            descendant.text = "\n" if ("\n" in descendant.text) else " "
+
+        if (descendant is not element) and descendant.tail and not descendant.tail.strip(_Whitespace):
+            descendant.tail = "\n" if ("\n" in descendant.tail) else " "
+
+def _GetAttributeValueLikeBeautifulSoup(element: lxml.html.HtmlElement, name: str) -> Union[str, List[str]]:
+
+    ##
+    #
+    # Retrieves the value of an attribute of an lxml element, in the form BeautifulSoup would use:
+    # multi-valued attributes (like "class") are split into lists.
+    #
+    # @param element The element.
+    # @param name    The name of the attribute.
+    #
+    # @return The value of the attribute.
+    #
+    ##
+
+    value = element.get(name)
+    if (name in _MultiValuedAttributes["*"]) or (name in _MultiValuedAttributes.get(element.tag, [])):
+        return value.split()
+
+    return value
+
+def _IsLXMLPreferred() -> bool:
+
+    ##
+    #
+    # Checks whether the lxml-based implementations should be used (for simple markup).
+    #
+    # @return **True** if they should, **False** otherwise.
+    #
+    ##
+
+    return ("lxml" == Configuration.HTMLParserName) and _LXMLImplementationsAvailable
+
+def _ParseHTMLUsingLXML(code: str) -> lxml.html.HtmlElement:
+
+    ##
+    #
+    # Parses HTML code using lxml.
+    #
+    # @param code The input code.
+    #
+    # @return The "body" element containing the code.
+    #
+    ##
+
+    return lxml.html.document_fromstring(f"<html><body>{code}</body></html>").body
+
+def _ReformatHTMLToXHTMLUsingLXML(code: str) -> str:
+
+    ##
+    #
+    # Reformats given HTML code as valid XHTML, using lxml. The output is identical to that of
+    # ReformatHTMLToXHTML(), as long as the code is simple markup (see IsMarkupSimple()).
+    #
+    # @param code Input HTML code.
+    #
+    # @return Output XHTML code.
+    #
+    ##
+
+    document = lxml.html.document_fromstring(code)
+    _CollapseWhitespaceText(document)
+
+    return _SerializeLikeBeautifulSoup(document, includeRoot = True)
+
+def _SerializeLikeBeautifulSoup(root: lxml.html.HtmlElement, includeRoot: bool = False) -> str:
+
+    ##
+    #
+    # Serializes an lxml tree, formatting the code the way BeautifulSoup does (attributes are sorted,
+    # for example).
+    #
+    # @param root        The root element of the tree.
+    # @param includeRoot Should the root element itself be serialized, or just its content?
+    #
+    # @return The code.
+    #
+    ##
+
+    pieces = []
+
+    for event, element in iterwalk(root, events = ("start", "end")):
+
+        isSerialized = includeRoot or (element is not root)
+
+        if "start" == event:
+
+            if isSerialized:
+
+                attributes = ""
+
+                for name in sorted(element.attrib):
+
+                    value = _GetAttributeValueLikeBeautifulSoup(element, name)
+                    value = escape(" ".join(value) if isinstance(value, list) else value, quote = False)
+
+                    quote = '"'
+                    if '"' in value:
+                        if "'" in value:
+                            value = value.replace('"', "&quot;")
+                        else:
+                            quote = "'"
+
+                    attributes += f" {name}={quote}{value}{quote}"
+
+                closingSlash = "/" if (element.tag in _VoidTags) else ""
+                pieces.append(f"<{element.tag}{attributes}{closingSlash}>")
+
+            if element.text:
+                pieces.append(escape(element.text, quote = False))
+
+        else:
+
+            if isSerialized and (element.tag not in _VoidTags):
+                pieces.append(f"</{element.tag}>")
+
+            if (element is not root) and element.tail:
+                pieces.append(escape(element.tail, quote = False))
+
+    return "".join(pieces)
+
+def _StripEmptyTagsUsingLXML(
+    code: str,
+    validEmptyTags: List[str] = [],
+    validEmptyTagAttributes: Dict = {}
+) -> str:
+
+    ##
+    #
+    # Strips all empty tags from code, using lxml. The output is identical to that of
+    # StripEmptyTags(), as long as the code is simple markup (see IsMarkupSimple()).
+    #
+    # @param code                    The input code.
+    # @param validEmptyTags          A list of tags allowed to be empty.
+    # @param validEmptyTagAttributes A dictionary of attributes with values that allow empty tag to
+    #                                get away with being empty.
+    #
+    # @return The processed code.
+    #
+    ##
+
+    body = _ParseHTMLUsingLXML(code)
+    _CollapseWhitespaceText(body)
+
+    for element in reversed(list(body.iterdescendants())):
+
+        if element.tag in validEmptyTags:
+            continue
+
+        elif len(element):
+            continue
+
+        elif element.text and element.text.strip():
+            continue
+
+        elif validEmptyTagAttributes:
+
+            validBecauseOfAttributes = False
+
+            for attribute, value in validEmptyTagAttributes.items():
+
+                if attribute not in element.attrib:
+                    continue
+
+                if value == _GetAttributeValueLikeBeautifulSoup(element, attribute):
+                    validBecauseOfAttributes = True
+
+            if validBecauseOfAttributes:
+                continue
+
+        element.drop_tree()
+
+    return _SerializeLikeBeautifulSoup(body)
+
+def _StripHTMLUsingLXML(code: str, paragraphSeparator: str = "\n\n") -> str:
+
+    ##
+    #
+    # Converts (cleaned) HTML code to raw text, using lxml. The output is identical to that of
+    # StripHTML(), as long as the code is simple markup (see IsMarkupSimple()).
+    #
+    # @param code               The input code, already cleaned using CleanHTML().
+    # @param paragraphSeparator Text to be inserted in place of paragraph breaks ("</p><p>").
+    #
+    # @return Raw text generated from the input code.
+    #
+    ##
+
+    # The text is split into strings at paragraph boundaries, just like it would be split by
+    # BeautifulSoup after the code has been passed through StripTags(code, ["p"]). That includes the
+    # newlines bleach inserts in place of stripped block-level tags.
+
+    strings = []
+    pieces = []
+    isFirstTag = True
+
+    for event, element in iterwalk(_ParseHTMLUsingLXML(code), events = ("start", "end")):
+
+        isParagraph = ("p" == element.tag)
+
+        if isParagraph:
+            strings.append("".join(pieces))
+            pieces = []
+
+        if "start" == event:
+
+            if ("body" != element.tag):
+
+                if (not isParagraph) and (element.tag in HTML_TAGS_BLOCK_LEVEL) and (not isFirstTag):
+                    pieces.append("\n")
+
+                isFirstTag = False
+
+            pieces.append(element.text or "")
+
+        else:
+
+            pieces.append(element.tail or "")
+
+    strings.append("".join(pieces))
+
+    return paragraphSeparator.join(
+        string if string.strip(_Whitespace) else ("\n" if ("\n" in string) else " ")
+        for string in strings
+        if string
+    )
+
+def _StripTagsUsingLXML(code: str, validTags: List[str] = []) -> str:
+
+    ##
+    #
+    # Strips all tags from code, with the exception of those designated "valid" tags, using lxml. The
+    # output is identical to that of StripTags(), as long as the code is simple markup (see
+    # IsMarkupSimple()).
+    #
+    # @param code      The input code.
+    # @param validTags A List of tags **not** to be stripped from the code.
+    #
+    # @return The processed code.
+    #
+    ##
+
+    body = _ParseHTMLUsingLXML(code)
+
+    # Attributes are filtered by bleach itself.
+
+    sanitizer = BleachSanitizerFilter(source = [], allowed_tags = validTags, strip_disallowed_tags = True)
+
+    pieces = []
+    isFirstTag = True
+
+    for event, element in iterwalk(body, events = ("start", "end")):
+
+        if element is body:
+
+            if ("start" == event) and element.text:
+                pieces.append(escape(element.text, quote = False))
+
+            continue
+
+        if "start" == event:
+
+            if element.tag in validTags:
+
+                attributes = ""
+
+                if element.attrib:
+
+                    token = sanitizer.allow_token({
+                        "type": "StartTag",
+                        "name": element.tag,
+                        "data": {(None, name): value for name, value in element.attrib.items()}
+                    })
+
+                    for (_, name), value in token["data"].items():
+
+                        value = value.replace("&", "&amp;").replace("<", "&lt;")
+
+                        if ('"' in value) and ("'" not in value):
+                            quote = "'"
+                        else:
+                            quote = '"'
+                            value = value.replace('"', "&quot;")
+
+                        attributes += f" {name}={quote}{value}{quote}"
+
+                pieces.append(f"<{element.tag}{attributes}>")
+
+            elif (element.tag in HTML_TAGS_BLOCK_LEVEL) and (not isFirstTag):
+
+                # bleach replaces stripped block-level tags with newlines (unless the tag is the
+                # first one in the code).
+
+                pieces.append("\n")
+
+            isFirstTag = False
+
+            if element.text:
+                pieces.append(escape(element.text, quote = False))
+
+        else:
+
+            if (element.tag in validTags) and (element.tag not in _VoidTags):
+                pieces.append(f"</{element.tag}>")
+
+            if element.tail:
+                pieces.append(escape(element.tail, quote = False))
+
+    return "".join(pieces)
\ No newline at end of file
@@ -51,12 +51,13 @@ import fiction_dl.Configuration as Configuration
 
 # Standard packages.
 
-from argparse import ArgumentParser, Namespace
+from argparse import ArgumentParser, ArgumentTypeError, Namespace
 from http.client import RemoteDisconnected
 import logging
 from pathlib import Path
 from requests.exceptions import ConnectionError
 from sys import exit
+from typing import List
 from urllib3.exceptions import ProtocolError
 
 #
@@ -160,6 +161,13 @@ def ReadCommandLineArguments() -> Namespace:
         help = "overwrites output files (in case they already exist)"
     )
 
+    argumentParser.add_argument(
+        "-u",
+        dest = "Update",
+        action = "store_true",
+        help = "updates stories downloaded already (downloads new chapters only)"
+    )
+
     argumentParser.add_argument(
         "-d",
         dest = "Debug",
@@ -181,6 +189,40 @@ def ReadCommandLineArguments() -> Namespace:
         help = "preserves the cache after the application quits"
     )
 
+    argumentParser.add_argument(
+        "-cache-size",
+        dest = "CacheSizeLimit",
+        type = float,
+        default = Configuration.CacheSizeLimit,
+        help = "the maximum size of the cache, in megabytes (least recently used stories are evicted)"
+    )
+
+    argumentParser.add_argument(
+        "-cache-ttl",
+        dest = "CacheItemLifetime",
+        type = float,
+        default = Configuration.CacheItemLifetime,
+        help = "the lifetime of cached items, in days"
+    )
+
+    argumentParser.add_argument(
+        "-jobs",
+        dest = "JobCount",
+        type = int,
+        default = Configuration.MaximumConcurrentStoryDownloads,
+        help = "the maximum number of stories downloaded at once (stories from different sites are downloaded concurrently)"
+    )
+
+    argumentParser.add_argument(
+        "-formats",
+        dest = "Formats",
+        type = ReadOutputFormats,
+        default = Configuration.OutputFormats,
+        help =
+            f"comma-separated list of output formats ({', '.join(Configuration.SupportedOutputFormats).lower()}); "
+            f"by default: {', '.join(Configuration.OutputFormats).lower()}"
+    )
+
     argumentParser.add_argument(
         "-lo",
         dest = "LibreOffice",
@@ -205,6 +247,29 @@ def ReadCommandLineArguments() -> Namespace:
 
     return argumentParser.parse_args()
 
+def ReadOutputFormats(text: str) -> List[str]:
+
+    ##
+    #
+    # Reads the list of output formats given as a command-line argument.
+    #
+    # @param text Comma-separated format names (case-insensitive).
+    #
+    # @return The list of output formats.
+    #
+    ##
+
+    formats = [x.strip().upper() for x in text.split(",") if x.strip()]
+
+    if not formats:
+        raise ArgumentTypeError("no output format has been specified")
+
+    for outputFormat in formats:
+        if outputFormat not in Configuration.SupportedOutputFormats:
+            raise ArgumentTypeError(f"unknown output format: \"{outputFormat.lower()}\"")
+
+    return formats
+
 #
 #
 #
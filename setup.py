@@ -61,9 +61,8 @@ setup(
     url = Configuration.ApplicationURL,
 
     install_requires = [
-        "PyMuPDF",
-        "bleach",
-        "bs4",
+        "beautifulsoup4>=4.9,<5",
+        "bleach>=4.0,<7",
         "dreamy-utilities>=1.2.0",
         "ebooklib",
         "fake-useragent",
@@ -72,7 +71,7 @@ setup(
         "markdown",
         "numpy",
         "opencv-python",
-        "pillow",
+        "pillow>=9.2",
         "praw",
         "pykakasi",
         "pyopenssl",
@@ -85,6 +84,7 @@ setup(
             "*.css",
             "*.html",
             "*.odt",
+            "*.txt",
             "*.xml"
         ]
 